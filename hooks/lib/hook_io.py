@@ -24,6 +24,22 @@ import sys
 from dataclasses import dataclass
 from typing import Any, Dict, Optional
 
+# orjson is optional - fall back to the stdlib when it isn't installed
+try:
+    import orjson
+
+    def _loads(s: str) -> Any:
+        return orjson.loads(s)
+
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+except ImportError:
+    def _loads(s: str) -> Any:
+        return json.loads(s)
+
+    def _dumps(obj: Any) -> str:
+        return json.dumps(obj, indent=2)
+
 
 @dataclass
 class HookInput:
@@ -41,7 +57,7 @@ class HookInput:
     def from_stdin(cls) -> "HookInput":
         """Parse hook input from stdin."""
         try:
-            data = json.load(sys.stdin)
+            data = _loads(sys.stdin.read())
         except json.JSONDecodeError:
             data = {}
         return cls.from_dict(data)
@@ -73,7 +89,7 @@ def parse_input() -> None:
         HOOK_STOP_ACTIVE, HOOK_EVENT_TYPE
     """
     try:
-        data = json.load(sys.stdin)
+        data = _loads(sys.stdin.read())
     except json.JSONDecodeError:
         data = {}
 
@@ -87,15 +103,17 @@ def parse_input() -> None:
     event_type = data.get('event_type', '')
     hook_event_name = data.get('hook_event_name', '')
 
-    # Output as bash variable assignments (safe for eval)
+    # Output as bash variable assignments (safe for eval), in a single write
     # Using printf-style escaping for safety
-    print(f'HOOK_TOOL_NAME="{_escape_bash(tool_name)}"')
-    print(f'HOOK_FILE_PATH="{_escape_bash(file_path)}"')
-    print(f'HOOK_CWD="{_escape_bash(cwd)}"')
-    print(f'HOOK_SESSION_ID="{_escape_bash(session_id)}"')
-    print(f'HOOK_STOP_ACTIVE="{stop_hook_active}"')
-    print(f'HOOK_EVENT_TYPE="{_escape_bash(event_type)}"')
-    print(f'HOOK_EVENT_NAME="{_escape_bash(hook_event_name)}"')
+    sys.stdout.write(
+        f'HOOK_TOOL_NAME="{_escape_bash(tool_name)}"\n'
+        f'HOOK_FILE_PATH="{_escape_bash(file_path)}"\n'
+        f'HOOK_CWD="{_escape_bash(cwd)}"\n'
+        f'HOOK_SESSION_ID="{_escape_bash(session_id)}"\n'
+        f'HOOK_STOP_ACTIVE="{stop_hook_active}"\n'
+        f'HOOK_EVENT_TYPE="{_escape_bash(event_type)}"\n'
+        f'HOOK_EVENT_NAME="{_escape_bash(hook_event_name)}"\n'
+    )
 
 
 def _escape_bash(s: str) -> str:
@@ -114,12 +132,11 @@ def block_response(reason: str, agent_content: Optional[str] = None) -> None:
         reason: The reason message to show the user
         agent_content: Optional additional agent content to append
     """
-    full_reason = reason
-    if agent_content:
-        full_reason = reason + agent_content
-
-    output = {"decision": "block", "reason": full_reason}
-    print(json.dumps(output, indent=2))
+    output = {
+        "decision": "block",
+        "reason": f"{reason}{agent_content}" if agent_content else reason,
+    }
+    print(_dumps(output))
 
 
 def approve_response() -> None:
@@ -146,7 +163,7 @@ def approve_with_message(reason: str, hook_event: str, context: str) -> None:
             "additionalContext": context
         }
     }
-    print(json.dumps(output, indent=2))
+    print(_dumps(output))
 
 
 def main():
@@ -17,7 +17,7 @@ import json
 import os
 import sys
 import tempfile
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 
 # TDD permissions to add/remove
@@ -85,7 +85,7 @@ def get_tdd_hooks(install_dir: str) -> Dict[str, List[Dict[str, Any]]]:
 
 def atomic_write(filepath: str, data: Dict[str, Any]) -> None:
     """Write JSON data to file atomically to prevent corruption."""
-    settings_dir = os.path.dirname(filepath)
+    settings_dir = os.path.dirname(filepath) or '.'
     with tempfile.NamedTemporaryFile(
         mode='w',
         dir=settings_dir,
@@ -94,9 +94,19 @@ def atomic_write(filepath: str, data: Dict[str, Any]) -> None:
     ) as f:
         temp_file = f.name
         json.dump(data, f, indent=2)
+        # Contents must be on disk before the rename can expose them
+        f.flush()
+        os.fsync(f.fileno())
 
     os.replace(temp_file, filepath)
 
+    # Persist the rename itself
+    dir_fd = os.open(settings_dir, os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
 
 def validate_settings(settings_file: str) -> bool:
     """Validate that a settings file is valid JSON."""
@@ -108,17 +118,17 @@ def validate_settings(settings_file: str) -> bool:
         return False
 
 
-def add_tdd_settings(settings_file: str, install_dir: str) -> None:
+def merge_tdd_settings(settings: Dict[str, Any], install_dir: str) -> Dict[str, Any]:
     """
-    Add TDD hooks and permissions to settings.json.
+    Merge TDD hooks and permissions into a settings dict, in place.
 
     Args:
-        settings_file: Path to settings.json
+        settings: Parsed settings.json contents
         install_dir: Path to TDD workflow installation directory
-    """
-    with open(settings_file, 'r') as f:
-        settings = json.load(f)
 
+    Returns:
+        The updated settings dict
+    """
     # Ensure permissions structure exists
     if 'permissions' not in settings:
         settings['permissions'] = {}
@@ -154,6 +164,22 @@ def add_tdd_settings(settings_file: str, install_dir: str) -> None:
             if hook_cmd not in existing_commands:
                 settings['hooks'][event].append(hook)
 
+    return settings
+
+
+def add_tdd_settings(settings_file: str, install_dir: str) -> None:
+    """
+    Add TDD hooks and permissions to settings.json.
+
+    Args:
+        settings_file: Path to settings.json
+        install_dir: Path to TDD workflow installation directory
+    """
+    with open(settings_file, 'r') as f:
+        settings = json.load(f)
+
+    merge_tdd_settings(settings, install_dir)
+
     # Write atomically
     atomic_write(settings_file, settings)
     print("Settings updated successfully.")
@@ -196,37 +222,41 @@ def remove_tdd_settings(settings_file: str) -> None:
     print("TDD hooks removed from settings.")
 
 
-def main():
-    if len(sys.argv) < 3:
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the CLI with argv (defaults to sys.argv[1:]); returns the exit code."""
+    if argv is None:
+        argv = sys.argv[1:]
+
+    if len(argv) < 2:
         print("Usage: settings_manager.py <command> <settings_file> [install_dir]", file=sys.stderr)
         print("Commands: add, remove, validate", file=sys.stderr)
-        sys.exit(1)
+        return 1
 
-    command = sys.argv[1]
-    settings_file = sys.argv[2]
+    command = argv[0]
+    settings_file = argv[1]
 
     if command == 'validate':
         if validate_settings(settings_file):
             print("Settings file is valid JSON.")
-            sys.exit(0)
-        else:
-            print("Settings file is not valid JSON.", file=sys.stderr)
-            sys.exit(1)
+            return 0
+        print("Settings file is not valid JSON.", file=sys.stderr)
+        return 1
 
     elif command == 'add':
-        if len(sys.argv) < 4:
+        if len(argv) < 3:
             print("Usage: settings_manager.py add <settings_file> <install_dir>", file=sys.stderr)
-            sys.exit(1)
-        install_dir = sys.argv[3]
+            return 1
+        install_dir = argv[2]
         add_tdd_settings(settings_file, install_dir)
+        return 0
 
     elif command == 'remove':
         remove_tdd_settings(settings_file)
+        return 0
 
-    else:
-        print(f"Unknown command: {command}", file=sys.stderr)
-        sys.exit(1)
+    print(f"Unknown command: {command}", file=sys.stderr)
+    return 1
 
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
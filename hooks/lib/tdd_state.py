@@ -166,8 +166,9 @@ class TDDState:
             return StateData()
 
         try:
-            with open(self._state_file, 'r') as f:
-                data = json.load(f)
+            # Binary I/O skips the text-mode decoder; json detects UTF-8 itself
+            with open(self._state_file, 'rb') as f:
+                data = json.loads(f.read())
 
             # Parse usage data with nested PhaseUsage objects
             usage_data = data.get("usage", {})
@@ -209,8 +210,8 @@ class TDDState:
 
         # Write to temp file first, then rename (atomic on POSIX)
         temp_file = self._state_file.with_suffix('.tmp')
-        with open(temp_file, 'w') as f:
-            json.dump(data, f, indent=2)
+        with open(temp_file, 'wb') as f:
+            f.write(json.dumps(data, indent=2).encode())
         temp_file.rename(self._state_file)
 
     def _update_state(self, **updates) -> StateData:
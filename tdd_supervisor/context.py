@@ -20,6 +20,8 @@ from .templates import (
     REQUIREMENTS_REVIEW_PROMPT,
     INTERFACES_REVIEW_PROMPT,
     TESTS_REVIEW_PROMPT,
+    COMPACT_STATE_PROMPT,
+    COMPACTED_SESSION_CONTEXT,
 )
 
 
@@ -103,3 +105,19 @@ class ContextBuilder:
             3: TESTS_REVIEW_PROMPT,
         }
         return prompts.get(phase, "")
+
+    @staticmethod
+    def get_compact_state_prompt() -> str:
+        """Get the prompt that condenses a long phase conversation."""
+        return COMPACT_STATE_PROMPT
+
+    @staticmethod
+    def build_compacted_context(phase: int, compact_state: str) -> str:
+        """
+        Build context that seeds a fresh session from a condensed conversation.
+
+        Args:
+            phase: Phase number the conversation belongs to
+            compact_state: Condensed state record from the original session
+        """
+        return COMPACTED_SESSION_CONTEXT.format(phase=phase, compact_state=compact_state)
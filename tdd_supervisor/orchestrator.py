@@ -7,10 +7,12 @@ managing context transfer between phases.
 """
 
 import asyncio
+import io
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, List
+from typing import Dict, Optional, List, Tuple
 
 try:
     from claude_agent_sdk import query, ClaudeAgentOptions
@@ -30,6 +32,10 @@ from .templates import (
     format_workflow_complete,
 )
 
+# Phases that produce a summary document / get a self-review pass
+SUMMARY_PHASES = frozenset(p for p in (1, 2, 3, 4) if ContextBuilder.get_summary_prompt(p))
+REVIEW_PHASES = frozenset(p for p in (1, 2, 3, 4) if ContextBuilder.get_review_prompt(p))
+
 
 def read_user_input(prompt: str = "") -> str:
     """
@@ -100,12 +106,23 @@ class TDDOrchestrator:
     SUMMARY_VERIFIED_SIGNAL = "SUMMARY_VERIFIED"
     GAPS_FOUND_SIGNAL = "GAPS_FOUND"
 
-    PHASE_NAMES = {
-        1: "Requirements Gathering",
-        2: "Interface Design",
-        3: "Test Writing",
-        4: "Implementation",
-    }
+    # Worker threads for blocking marker/document I/O off the event loop
+    EXECUTOR_WORKERS = 2
+
+    # Phase transcripts larger than this are condensed before summarizing
+    TRANSCRIPT_BUDGET_BYTES = 30 * 1024
+
+    # Buffered stream output is flushed once it grows past this many characters
+    OUTPUT_FLUSH_THRESHOLD = 4096
+
+    # Indexed by phase number (1-4); index 0 is unused
+    PHASE_NAMES = (
+        "",
+        "Requirements Gathering",
+        "Interface Design",
+        "Test Writing",
+        "Implementation",
+    )
 
     def __init__(self, working_dir: Optional[str] = None):
         """
@@ -121,6 +138,20 @@ class TDDOrchestrator:
             workflow_id=self.markers.workflow_id
         )
 
+        # Phase document contents keyed by path, validated against (mtime_ns, size)
+        self._document_cache: Dict[str, Tuple[int, int, str]] = {}
+
+        # Streamed text waiting to be written to stdout
+        self._out_buf: List[str] = []
+        self._out_len = 0
+
+        # Approximate size of the current phase conversation
+        self._phase_transcript_bytes = 0
+
+        # Pool for blocking I/O, created and installed as the loop's default
+        # executor by run()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
         # Validate working directory
         if not self.working_dir.is_dir():
             raise ValueError(f"Working directory does not exist: {self.working_dir}")
@@ -132,12 +163,21 @@ class TDDOrchestrator:
         Args:
             initial_task: Optional initial task description
         """
+        # Pre-warm the pool while the header prints
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.EXECUTOR_WORKERS,
+            thread_name_prefix="tdd-supervisor",
+        )
+        self._executor.submit(lambda: None)
+
         print(format_workflow_header(
             working_dir=str(self.working_dir),
             workflow_id=self.markers.workflow_id,
             markers_dir=str(self.markers.get_marker_dir())
         ))
 
+        asyncio.get_running_loop().set_default_executor(self._executor)
+
         try:
             # Initialize markers and log start
             self.markers.initialize()
@@ -160,16 +200,20 @@ class TDDOrchestrator:
             print(format_workflow_complete())
 
         except KeyboardInterrupt:
+            self._flush_output()
             print("\n\nWorkflow interrupted by user.")
             self.logger.log_workflow_aborted("User interrupted")
             self.markers.cleanup()
             print("Markers cleaned up.")
         except Exception as e:
+            self._flush_output()
             print(f"\n\nWorkflow error: {e}", file=sys.stderr)
             self.logger.log_error("Workflow failed", e)
             self.logger.log_workflow_aborted(str(e))
             self.markers.cleanup()
             raise
+        finally:
+            self._executor.shutdown(wait=False)
 
     def _build_phase_context(self, phase: int, initial_task: Optional[str] = None) -> str:
         """Build context for a specific phase."""
@@ -177,22 +221,56 @@ class TDDOrchestrator:
             return ContextBuilder.build_phase1_context(initial_task)
         elif phase == 2:
             return ContextBuilder.build_phase2_context(
-                self.markers.get_requirements_summary()
+                self._read_phase_document(1)
             )
         elif phase == 3:
             return ContextBuilder.build_phase3_context(
-                self.markers.get_requirements_summary(),
-                self.markers.get_interfaces_list()
+                self._read_phase_document(1),
+                self._read_phase_document(2)
             )
         elif phase == 4:
             return ContextBuilder.build_phase4_context(
-                self.markers.get_requirements_summary(),
-                self.markers.get_interfaces_list(),
-                self.markers.get_tests_list()
+                self._read_phase_document(1),
+                self._read_phase_document(2),
+                self._read_phase_document(3)
             )
         else:
             raise ValueError(f"Invalid phase: {phase}")
 
+    def _read_phase_document(self, phase: int) -> str:
+        """
+        Read a phase document, reusing cached content while the file is unchanged.
+
+        Entries are validated against the file's mtime and size, so manual
+        edits made between phases are still picked up.
+
+        Args:
+            phase: Phase number (1-4)
+
+        Returns:
+            Document content, or empty string if not found
+        """
+        path = self.markers.get_phase_document_path(phase)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self._document_cache.pop(path, None)
+            return ""
+
+        cached = self._document_cache.get(path)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+
+        content = self.markers.get_phase_document(phase)
+        self._document_cache[path] = (stat.st_mtime_ns, stat.st_size, content)
+        return content
+
+    def _save_phase_document(self, phase: int, content: str) -> str:
+        """Save a phase document and drop its cached content."""
+        doc_path = self.markers.save_phase_document(phase, content)
+        self._document_cache.pop(self.markers.get_phase_document_path(phase), None)
+        return doc_path
+
     async def _run_phase(self, phase: int, initial_task: Optional[str] = None) -> None:
         """
         Run a single TDD phase.
@@ -201,13 +279,15 @@ class TDDOrchestrator:
             phase: Phase number (1-4)
             initial_task: Initial task description (phase 1 only)
         """
+        if not 1 <= phase <= 4:
+            raise ValueError(f"Invalid phase: {phase}")
         phase_name = self.PHASE_NAMES[phase]
         print(format_phase_header(phase, phase_name))
         self.markers.set_phase(phase)
         self.logger.log_phase_start(phase, phase_name)
 
-        # Build and save context
-        context = self._build_phase_context(phase, initial_task)
+        # Build and save context (reads previous phase documents from disk)
+        context = await asyncio.to_thread(self._build_phase_context, phase, initial_task)
         context_path = self.markers.save_phase_context(phase, context)
         if context_path:
             self.logger.log_phase_context_saved(phase, context_path)
@@ -216,9 +296,14 @@ class TDDOrchestrator:
         session_id = await self._run_phase_session(context, phase)
 
         if phase < 4:
+            # Condense a long session first; summary, review and regeneration
+            # queries all resume the condensed one
+            if phase in SUMMARY_PHASES and self._phase_transcript_bytes > self.TRANSCRIPT_BUDGET_BYTES:
+                session_id = await self._compact_session(phase, session_id)
+
             # Generate summary and save as document
             summary = await self._generate_and_verify_summary(phase, session_id)
-            doc_path = self.markers.save_phase_document(phase, summary)
+            doc_path = self._save_phase_document(phase, summary)
             if doc_path:
                 self.logger.log_phase_summary_saved(phase, doc_path)
                 print(f"\n[Supervisor] {phase_name} document saved: {doc_path}")
@@ -231,7 +316,7 @@ class TDDOrchestrator:
                     break
                 elif action == 'edit':
                     # Verify the edited document can be read
-                    edited_content = self.markers.get_phase_document(phase)
+                    edited_content = await asyncio.to_thread(self._read_phase_document, phase)
                     if edited_content:
                         # Show preview of edited content
                         preview_lines = edited_content.strip().split('\n')[:5]
@@ -248,7 +333,7 @@ class TDDOrchestrator:
                 elif action == 'regenerate':
                     # Regenerate summary with user feedback
                     summary = await self._regenerate_summary(phase, session_id)
-                    doc_path = self.markers.save_phase_document(phase, summary)
+                    doc_path = self._save_phase_document(phase, summary)
                     if doc_path:
                         self.logger.log_phase_summary_saved(phase, doc_path)
                         print(f"[Supervisor] Updated document saved: {doc_path}")
@@ -279,6 +364,7 @@ class TDDOrchestrator:
         session_id = None
         phase_complete = False
         working_indicator_shown = False
+        self._phase_transcript_bytes = len(initial_context.encode())
 
         # Initial query with context
         async for message in query(
@@ -298,13 +384,15 @@ class TDDOrchestrator:
                 for block in message.content:
                     if hasattr(block, 'text'):
                         if working_indicator_shown:
-                            print("\n", end='')  # New line after dots
+                            self._emit("\n")  # New line after dots
                             working_indicator_shown = False
-                        print(block.text, end='', flush=True)
+                        self._emit(block.text)
+                        self._phase_transcript_bytes += len(block.text.encode())
                         if self.PHASE_COMPLETE_SIGNAL in block.text:
                             phase_complete = True
                     elif hasattr(block, 'name'):
                         # Tool use - show dot as progress indicator
+                        self._flush_output()
                         print(".", end='', flush=True)
                         working_indicator_shown = True
 
@@ -312,6 +400,8 @@ class TDDOrchestrator:
             if isinstance(message, ResultMessage):
                 self._record_usage(phase, message)
 
+        self._flush_output()
+
         # If phase not complete, continue interactive loop
         first_input = True
         while not phase_complete:
@@ -339,6 +429,7 @@ class TDDOrchestrator:
                 raise KeyboardInterrupt("User requested abort")
 
             # Continue conversation
+            self._phase_transcript_bytes += len(user_input.encode())
             print("\n", end='', flush=True)
             working_indicator_shown = False
             async for message in query(
@@ -355,21 +446,47 @@ class TDDOrchestrator:
                     for block in message.content:
                         if hasattr(block, 'text'):
                             if working_indicator_shown:
-                                print("\n", end='')  # New line after progress dots
+                                self._emit("\n")  # New line after progress dots
                                 working_indicator_shown = False
-                            print(block.text, end='', flush=True)
+                            self._emit(block.text)
+                            self._phase_transcript_bytes += len(block.text.encode())
                             if self.PHASE_COMPLETE_SIGNAL in block.text:
                                 phase_complete = True
                         elif hasattr(block, 'name'):
                             # Tool use - show dot as progress indicator
+                            self._flush_output()
                             print(".", end='', flush=True)
 
                 # Capture usage from ResultMessage
                 if isinstance(message, ResultMessage):
                     self._record_usage(phase, message)
 
+            self._flush_output()
+
         return session_id
 
+    def _emit(self, text: str) -> None:
+        """
+        Buffer streamed text, writing it out on line boundaries.
+
+        Avoids one flushed write per streamed block; the buffer is also
+        flushed before progress dots and at the end of each stream so
+        output ordering is preserved.
+        """
+        self._out_buf.append(text)
+        self._out_len += len(text)
+        if '\n' in text or self._out_len > self.OUTPUT_FLUSH_THRESHOLD:
+            self._flush_output()
+
+    def _flush_output(self) -> None:
+        """Write any buffered streamed text to stdout."""
+        if not self._out_buf:
+            return
+        sys.stdout.write(''.join(self._out_buf))
+        sys.stdout.flush()
+        self._out_buf.clear()
+        self._out_len = 0
+
     def _record_usage(self, phase: int, result: ResultMessage) -> None:
         """
         Record usage data from a ResultMessage.
@@ -405,7 +522,7 @@ class TDDOrchestrator:
         for phase_num in [1, 2, 3, 4]:
             phase_key = f"phase{phase_num}"
             phase_data = usage.get(phase_key, {})
-            phase_name = self.PHASE_NAMES.get(phase_num, f"Phase {phase_num}")
+            phase_name = self.PHASE_NAMES[phase_num]
 
             input_tokens = phase_data.get("input_tokens", 0)
             output_tokens = phase_data.get("output_tokens", 0)
@@ -454,11 +571,13 @@ class TDDOrchestrator:
         Returns:
             Action to take: 'proceed', 'edit', or 'regenerate'
         """
-        name = self.PHASE_NAMES.get(phase, f"Phase {phase}")
+        name = self.PHASE_NAMES[phase] if 1 <= phase <= 4 else f"Phase {phase}"
 
         print(format_phase_complete_banner(phase, name, doc_path))
 
         while True:
+            # Read on the main thread, like read_user_input: Ctrl+C must raise
+            # KeyboardInterrupt here so run() can clean up
             response = input("\nYour choice [y/e/r]: ").strip().lower()
 
             if response in ['y', 'yes', '']:
@@ -495,18 +614,18 @@ class TDDOrchestrator:
             Verified summary text
         """
         # Step 1: Generate initial summary
-        summary_prompt = ContextBuilder.get_summary_prompt(phase)
-        if not summary_prompt:
+        if phase not in SUMMARY_PHASES:
             return ""
+        summary_prompt = ContextBuilder.get_summary_prompt(phase)
 
         print(f"\n[Supervisor] Generating phase {phase} summary...")
 
         initial_summary = await self._query_for_text(summary_prompt, session_id=session_id, phase=phase)
 
         # Step 2: Self-review
-        review_prompt = ContextBuilder.get_review_prompt(phase)
-        if not review_prompt:
+        if phase not in REVIEW_PHASES:
             return initial_summary
+        review_prompt = ContextBuilder.get_review_prompt(phase)
 
         print(f"[Supervisor] Verifying summary completeness...")
 
@@ -537,6 +656,85 @@ class TDDOrchestrator:
             print(f"[Supervisor] Summary captured.")
             return review_response if review_response else initial_summary
 
+    async def _compact_session(self, phase: int, session_id: Optional[str]) -> Optional[str]:
+        """
+        Condense a long phase session into a fresh, smaller session.
+
+        Asks the current session for a compact state record, then seeds a new
+        session with it. Later queries resume the new session instead of
+        replaying the full phase conversation.
+
+        Args:
+            phase: Phase number
+            session_id: Session ID of the phase conversation
+
+        Returns:
+            Session ID to resume from (the original one if compaction failed)
+        """
+        print(f"\n[Supervisor] Condensing phase {phase} conversation...")
+
+        compact_state = await self._query_for_text(
+            ContextBuilder.get_compact_state_prompt(),
+            session_id=session_id,
+            phase=phase
+        )
+        if not compact_state:
+            return session_id
+
+        new_session_id = await self._start_session(
+            ContextBuilder.build_compacted_context(phase, compact_state),
+            phase=phase
+        )
+        if not new_session_id:
+            return session_id
+
+        self._phase_transcript_bytes = len(compact_state.encode())
+        self.logger.log_event("PHASE", f"Phase {phase} conversation condensed")
+        return new_session_id
+
+    async def _start_session(
+        self,
+        prompt: str,
+        phase: Optional[int] = None,
+        timeout: float = 300.0
+    ) -> Optional[str]:
+        """
+        Start a new session with the given prompt and return its session ID.
+
+        Args:
+            prompt: Initial prompt for the session
+            phase: Optional phase number for usage tracking
+            timeout: Maximum time to wait in seconds (default 5 minutes)
+
+        Returns:
+            Session ID, or None if the SDK did not report one or timed out
+        """
+        session_id = None
+
+        async def collect_session_id() -> None:
+            nonlocal session_id
+            async for message in query(
+                prompt=prompt,
+                options=ClaudeAgentOptions(
+                    cwd=str(self.working_dir),
+                    env=self.markers.get_env_vars(),
+                    permission_mode="bypassPermissions",
+                )
+            ):
+                if hasattr(message, 'session_id') and message.session_id:
+                    session_id = message.session_id
+
+                if isinstance(message, ResultMessage) and phase:
+                    self._record_usage(phase, message)
+
+        try:
+            await asyncio.wait_for(collect_session_id(), timeout=timeout)
+        except asyncio.TimeoutError:
+            print(f"\n[Supervisor] Session start timed out after {timeout}s", file=sys.stderr)
+            return None
+
+        return session_id
+
     async def _regenerate_summary(
         self,
         phase: int,
@@ -553,7 +751,7 @@ class TDDOrchestrator:
             Regenerated summary text
         """
         # Get current summary for reference
-        current_summary = self.markers.get_phase_document(phase)
+        current_summary = await asyncio.to_thread(self._read_phase_document, phase)
 
         # Get user feedback
         print("\n[Supervisor] What changes would you like to make?")
@@ -615,7 +813,7 @@ their requested changes. Output ONLY the updated summary, no explanations.
         Returns:
             Collected text response
         """
-        text_parts: List[str] = []
+        buf = io.StringIO()
         env_vars = self.markers.get_env_vars()
 
         async def collect_response() -> None:
@@ -631,7 +829,7 @@ their requested changes. Output ONLY the updated summary, no explanations.
                 if isinstance(message, AssistantMessage) and message.content:
                     for block in message.content:
                         if hasattr(block, 'text'):
-                            text_parts.append(block.text)
+                            buf.write(block.text)
 
                 # Capture usage from ResultMessage
                 if isinstance(message, ResultMessage) and phase:
@@ -642,7 +840,7 @@ their requested changes. Output ONLY the updated summary, no explanations.
         except asyncio.TimeoutError:
             print(f"\n[Supervisor] Query timed out after {timeout}s", file=sys.stderr)
 
-        return ''.join(text_parts)
+        return buf.getvalue()
 
 
 async def run_supervisor(
@@ -352,6 +352,37 @@ If everything is complete with full coverage:
 """
 
 
+# =============================================================================
+# SESSION COMPACTION TEMPLATES
+# =============================================================================
+
+COMPACT_STATE_PROMPT = """
+Our conversation for this phase has grown long. Before writing the phase summary,
+condense everything relevant into a compact state record.
+
+## Include
+- Every decision, requirement, and constraint we agreed on
+- Edge cases and error scenarios discussed
+- Files created or modified (with paths)
+- Open questions that are still unresolved
+
+## Rules
+- Be complete but terse - bullet points, no prose
+- Do NOT drop details that later summary steps would need
+- Output ONLY the state record, no explanations
+"""
+
+COMPACTED_SESSION_CONTEXT = """# TDD Workflow - Phase {phase} (Condensed)
+
+The earlier conversation for this phase was condensed into the state record below.
+Treat it as the complete record of our discussion so far.
+
+## Conversation State
+{compact_state}
+
+Reply with "READY" only.
+"""
+
 # =============================================================================
 # CONSOLE OUTPUT FUNCTIONS
 # =============================================================================
@@ -9,6 +9,7 @@
 #   -i, --integration Run only integration tests (bash)
 #   -v, --verbose     Verbose output
 #   -e, --e2e         Include E2E tests (skipped by default)
+#   --benchmark       Include benchmarks (skipped by default, needs pytest-benchmark)
 #   --filter PATTERN  Run tests matching pattern
 
 set -e
@@ -23,6 +24,7 @@ RUN_UNIT=true
 RUN_INTEGRATION=true
 VERBOSE=""
 RUN_E2E=""
+RUN_BENCHMARKS=""
 FILTER=""
 
 # Parse arguments
@@ -56,6 +58,10 @@ while [[ $# -gt 0 ]]; do
             RUN_E2E="yes"
             shift
             ;;
+        --benchmark)
+            RUN_BENCHMARKS="yes"
+            shift
+            ;;
         --filter)
             FILTER="$2"
             shift 2
@@ -70,6 +76,7 @@ while [[ $# -gt 0 ]]; do
             echo "  -i, --integration Run only integration tests (bash)"
             echo "  -v, --verbose     Verbose output"
             echo "  -e, --e2e         Include E2E tests (skipped by default)"
+            echo "  --benchmark       Include benchmarks (skipped by default, needs pytest-benchmark)"
             echo "  --filter PATTERN  Run tests matching pattern"
             exit 0
             ;;
@@ -122,8 +129,22 @@ if [[ "$RUN_PYTHON" == "true" ]]; then
             echo "E2E tests enabled"
         fi
 
+        # Set benchmark environment variable if requested
+        if [[ -n "$RUN_BENCHMARKS" ]]; then
+            export RUN_BENCHMARKS=1
+            echo "Benchmarks enabled"
+        fi
+
+        # Run in parallel when pytest-xdist is installed (benchmarks need a
+        # single process, pytest-benchmark disables itself under xdist).
+        # loadfile keeps a module on one worker so module fixtures build once
+        PYTEST_PARALLEL=""
+        if [[ -z "$RUN_BENCHMARKS" ]] && python3 -c "import xdist" &> /dev/null; then
+            PYTEST_PARALLEL="-n auto --dist loadfile"
+        fi
+
         cd "$PROJECT_ROOT"
-        if python3 -m pytest tests/unit/python/ $PYTEST_OPTS $PYTEST_FILTER; then
+        if python3 -m pytest tests/unit/python/ $PYTEST_OPTS $PYTEST_PARALLEL $PYTEST_FILTER; then
             echo ""
             TESTS_PASSED=$((TESTS_PASSED + 1))
         else
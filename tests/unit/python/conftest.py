@@ -0,0 +1,89 @@
+"""
+Shared pytest fixtures for the Python unit tests.
+"""
+
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture
+def tmp_home(tmp_path):
+    """Per-test directory used as HOME for hooks under test."""
+    return tmp_path
+
+
+@pytest.fixture
+def patched_home(tmp_home, monkeypatch):
+    """tmp_home, also returned by Path.home() for code under test in-process."""
+    monkeypatch.setattr(Path, "home", lambda: tmp_home)
+    return tmp_home
+
+
+@pytest.fixture
+def markers_dir(tmp_home):
+    """Created TDD markers directory for the 'test-session' session."""
+    d = tmp_home / ".claude" / "tmp" / "tdd-test-session"
+    d.mkdir(parents=True)
+    return d
+
+
+@pytest.fixture(scope="session")
+def maven_skeleton(tmp_path_factory):
+    d = tmp_path_factory.mktemp("mvn")
+    (d / "pom.xml").write_text("<project></project>")
+    return d
+
+
+@pytest.fixture(scope="session")
+def typescript_skeleton(tmp_path_factory):
+    d = tmp_path_factory.mktemp("ts")
+    (d / "package.json").write_text('{"name": "test"}')
+    (d / "tsconfig.json").write_text('{}')
+    return d
+
+
+def _link_project(skeleton, tmp_home):
+    # Build files are hardlinked from the shared skeleton: replace them
+    # rather than editing in place
+    p = tmp_home / "project"
+    shutil.copytree(skeleton, p, copy_function=os.link)
+    return p
+
+
+@pytest.fixture
+def maven_project(tmp_home, maven_skeleton):
+    """Project directory with a pom.xml, detected as a Maven project."""
+    return _link_project(maven_skeleton, tmp_home)
+
+
+@pytest.fixture
+def typescript_project(tmp_home, typescript_skeleton):
+    """Project directory with package.json and tsconfig.json (TypeScript)."""
+    return _link_project(typescript_skeleton, tmp_home)
+
+
+@pytest.fixture(scope="module")
+def shared_home(tmp_path_factory):
+    """Home returned by Path.home() for a module's shared objects; see read_only_home."""
+    home = tmp_path_factory.mktemp("shared_home")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(Path, "home", lambda: home)
+        # Tests may run from inside a supervised session; keep its env out
+        mp.delenv("TDD_SUPERVISOR_ACTIVE", raising=False)
+        mp.delenv("TDD_SUPERVISOR_MARKERS_DIR", raising=False)
+        yield home
+
+
+def _files_under(d):
+    return [p for p in d.rglob("*") if p.is_file()]
+
+
+@pytest.fixture
+def read_only_home(shared_home):
+    """shared_home for one read-only test; fails the test if a file is written under it."""
+    assert not _files_under(shared_home), "shared_home was modified by an earlier test"
+    yield shared_home
+    assert not _files_under(shared_home), "test wrote to the read-only shared_home"
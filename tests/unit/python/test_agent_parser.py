@@ -11,8 +11,6 @@ import pytest
 from pathlib import Path
 from unittest.mock import patch
 
-# Add hooks/lib to path
-sys.path.insert(0, 'hooks/lib')
 from agent_parser import (
     parse_frontmatter,
     get_content_without_frontmatter,
@@ -412,7 +410,3 @@ phases: [2]
                 with pytest.raises(SystemExit) as exc_info:
                     main()
                 assert exc_info.value.code == 1
-
-
-if __name__ == '__main__':
-    pytest.main([__file__, '-v'])
@@ -5,13 +5,6 @@ Unit tests for formatters.py
 These are pure function tests - no mocking needed.
 """
 
-import sys
-from pathlib import Path
-
-# Add hooks/lib to path
-PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
-sys.path.insert(0, str(PROJECT_ROOT / "hooks" / "lib"))
-
 from formatters import (
     truncate_head,
     truncate_tail,
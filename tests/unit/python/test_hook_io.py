@@ -3,231 +3,296 @@
 Unit tests for hook_io.py
 
 Tests the hook input parsing and response generation functions.
+
+Convention: regexes used by the helpers below (e.g. _HOOK_RE) are compiled
+once at module level. Do not call re.compile inside helpers or tests.
 """
 
 import json
+import os
+import re
 import sys
 import io
 import pytest
 from unittest.mock import patch
 
-# Add the hooks/lib directory to the path
-sys.path.insert(0, 'hooks/lib')
 from hook_io import (
+    HookInput,
     parse_input,
     block_response,
     approve_response,
     approve_with_message,
+    main,
     _escape_bash,
 )
 
+try:
+    import pytest_benchmark  # noqa: F401
+    HAS_BENCHMARK = True
+except ImportError:
+    HAS_BENCHMARK = False
 
-class TestEscapeBash:
-    """Tests for _escape_bash function."""
-
-    def test_empty_string(self):
-        assert _escape_bash('') == ''
+# Matches HOOK_NAME="value" assignments emitted by parse_input (value left escaped)
+_HOOK_RE = re.compile(r'(HOOK_\w+)="((?:[^"\\]|\\.)*)"')
 
-    def test_none_returns_empty(self):
-        assert _escape_bash(None) == ''
 
-    def test_simple_string(self):
-        assert _escape_bash('hello') == 'hello'
+def _hooks(out):
+    """Extract HOOK_* assignments from parse_input output into a dict."""
+    return dict(_HOOK_RE.findall(out))
 
-    def test_escapes_backslash(self):
-        assert _escape_bash('path\\to\\file') == 'path\\\\to\\\\file'
 
-    def test_escapes_double_quote(self):
-        assert _escape_bash('say "hello"') == 'say \\"hello\\"'
+def _assert_hooks(out, expected):
+    """Assert that parse_input output contains the expected HOOK_* values, in any layout."""
+    got = _hooks(out)
+    assert expected.items() <= got.items(), {k: got.get(k) for k in expected}
 
-    def test_escapes_backtick(self):
-        assert _escape_bash('run `cmd`') == 'run \\`cmd\\`'
 
-    def test_escapes_dollar_sign(self):
-        assert _escape_bash('$HOME/path') == '\\$HOME/path'
+def _json_out(capture):
+    """Decode the JSON a response function wrote to stdout (whitespace-agnostic)."""
+    return json.loads(capture.readouterr().out)
 
-    def test_escapes_multiple_special_chars(self):
-        input_str = 'echo "$HOME" `pwd`'
-        expected = 'echo \\"\\$HOME\\" \\`pwd\\`'
-        assert _escape_bash(input_str) == expected
 
-    def test_preserves_single_quotes(self):
-        assert _escape_bash("it's fine") == "it's fine"
+class TestEscapeBash:
+    """Tests for _escape_bash function."""
 
-    def test_preserves_newlines(self):
-        assert _escape_bash("line1\nline2") == "line1\nline2"
+    @pytest.mark.parametrize("inp,expected", [
+        ('', ''),
+        (None, ''),
+        ('hello', 'hello'),
+        ('path\\to\\file', 'path\\\\to\\\\file'),
+        ('say "hello"', 'say \\"hello\\"'),
+        ('run `cmd`', 'run \\`cmd\\`'),
+        ('$HOME/path', '\\$HOME/path'),
+        ('echo "$HOME" `pwd`', 'echo \\"\\$HOME\\" \\`pwd\\`'),
+        ("it's fine", "it's fine"),
+        ("line1\nline2", "line1\nline2"),
+    ], ids=[
+        "empty_string",
+        "none_returns_empty",
+        "simple_string",
+        "escapes_backslash",
+        "escapes_double_quote",
+        "escapes_backtick",
+        "escapes_dollar_sign",
+        "escapes_multiple_special_chars",
+        "preserves_single_quotes",
+        "preserves_newlines",
+    ])
+    def test_escape_bash(self, inp, expected):
+        assert _escape_bash(inp) == expected
+
+    def test_string_without_special_chars_returned_unchanged(self):
+        path = '/project/src/main/kotlin/App.kt'
+        assert _escape_bash(path) == path
+
+    def test_escape_bash_large_path(self):
+        """A 64KiB path escapes in linear time with every special char handled."""
+        segment = '/dir$name'
+        path = segment * (64 * 1024 // len(segment))
+        result = _escape_bash(path)
+        assert result == path.replace('$', '\\$')
+        assert len(result) == len(path) + path.count('$')
+
+
+@pytest.mark.skipif(
+    not HAS_BENCHMARK or os.environ.get('RUN_BENCHMARKS') != '1',
+    reason="Benchmarks skipped by default. Install pytest-benchmark and use --benchmark flag or set RUN_BENCHMARKS=1"
+)
+class TestEscapeBashPerf:
+    """Micro-benchmarks guarding _escape_bash performance."""
+
+    @pytest.mark.benchmark(group='escape_bash')
+    def test_escape_bash_perf(self, benchmark):
+        """4KiB path with a '$' every 64 bytes."""
+        path = ('a' * 63 + '$') * 64
+        result = benchmark(_escape_bash, path)
+        assert result.count('\\$') == 64
+
+    @pytest.mark.benchmark(group='escape_bash')
+    def test_escape_bash_perf_no_specials(self, benchmark):
+        """4KiB path with nothing to escape (the common case)."""
+        path = '/project/src/' + 'a' * (4096 - len('/project/src/'))
+        result = benchmark(_escape_bash, path)
+        assert result == path
+
+
+class TestJsonBackend:
+    """Tests for the optional orjson backend and its stdlib fallback."""
+
+    def test_dumps_loads_round_trip(self):
+        import hook_io
+        data = {'decision': 'block', 'reason': 'Unicode \u00e9 and "quotes"'}
+        assert hook_io._loads(hook_io._dumps(data)) == data
+
+    def test_falls_back_to_stdlib_json_without_orjson(self):
+        import importlib
+        import hook_io
+        try:
+            with patch.dict(sys.modules, {'orjson': None}):
+                importlib.reload(hook_io)
+                assert hook_io._dumps({'a': 1}) == json.dumps({'a': 1}, indent=2)
+                assert hook_io._loads('{"a": 1}') == {'a': 1}
+        finally:
+            importlib.reload(hook_io)
+
+
+# Hook inputs serialized once at import, keyed by case name
+FIXTURES = {name: json.dumps(data) for name, data in {
+    'complete': {
+        'tool_name': 'Write',
+        'tool_input': {'file_path': '/path/to/file.py'},
+        'cwd': '/project',
+        'session_id': 'abc123',
+        'stop_hook_active': False,
+        'hook_event_name': 'PostToolUse'
+    },
+    'empty': {},
+    'missing_tool_input': {'tool_name': 'Read', 'cwd': '/project'},
+    'tool_input_not_dict': {'tool_name': 'Bash', 'tool_input': 'ls -la'},
+    'special_chars_in_path': {'tool_input': {'file_path': '/path/with spaces/$var/file.py'}},
+    'stop_hook_active': {'stop_hook_active': True},
+    'cli_parse': {'tool_name': 'Edit', 'session_id': 'test'},
+}.items()}
+# Degenerate inputs that must be tolerated without raising
+FIXTURES['invalid_json'] = 'not valid json'
+FIXTURES['no_input'] = ''
+
+
+@pytest.fixture
+def run_parse(capsys, monkeypatch):
+    """Run parse_input on raw stdin text and return its stdout."""
+    def _run(stdin_text):
+        monkeypatch.setattr('sys.stdin', io.StringIO(stdin_text))
+        parse_input()
+        return capsys.readouterr().out
+    return _run
 
 
 class TestParseInput:
     """Tests for parse_input function."""
 
-    def test_parses_complete_input(self, capsys):
-        input_data = {
-            'tool_name': 'Write',
-            'tool_input': {'file_path': '/path/to/file.py'},
-            'cwd': '/project',
-            'session_id': 'abc123',
-            'stop_hook_active': False,
-            'hook_event_name': 'PostToolUse'
-        }
-
-        with patch('sys.stdin', io.StringIO(json.dumps(input_data))):
-            parse_input()
-
-        captured = capsys.readouterr()
-        assert 'HOOK_TOOL_NAME="Write"' in captured.out
-        assert 'HOOK_FILE_PATH="/path/to/file.py"' in captured.out
-        assert 'HOOK_CWD="/project"' in captured.out
-        assert 'HOOK_SESSION_ID="abc123"' in captured.out
-        assert 'HOOK_STOP_ACTIVE="False"' in captured.out
-        assert 'HOOK_EVENT_NAME="PostToolUse"' in captured.out
-
-    def test_handles_empty_json(self, capsys):
-        with patch('sys.stdin', io.StringIO('{}')):
-            parse_input()
-
-        captured = capsys.readouterr()
-        assert 'HOOK_TOOL_NAME=""' in captured.out
-        assert 'HOOK_FILE_PATH=""' in captured.out
-        assert 'HOOK_SESSION_ID="unknown"' in captured.out
-
-    def test_handles_invalid_json(self, capsys):
-        with patch('sys.stdin', io.StringIO('not valid json')):
-            parse_input()
-
-        captured = capsys.readouterr()
-        assert 'HOOK_TOOL_NAME=""' in captured.out
-        assert 'HOOK_SESSION_ID="unknown"' in captured.out
-
-    def test_handles_missing_tool_input(self, capsys):
-        input_data = {'tool_name': 'Read', 'cwd': '/project'}
-
-        with patch('sys.stdin', io.StringIO(json.dumps(input_data))):
-            parse_input()
-
-        captured = capsys.readouterr()
-        assert 'HOOK_TOOL_NAME="Read"' in captured.out
-        assert 'HOOK_FILE_PATH=""' in captured.out
-
-    def test_handles_tool_input_not_dict(self, capsys):
-        input_data = {'tool_name': 'Bash', 'tool_input': 'ls -la'}
-
-        with patch('sys.stdin', io.StringIO(json.dumps(input_data))):
-            parse_input()
-
-        captured = capsys.readouterr()
-        assert 'HOOK_FILE_PATH=""' in captured.out
-
-    def test_escapes_special_characters_in_path(self, capsys):
-        input_data = {
-            'tool_input': {'file_path': '/path/with spaces/$var/file.py'}
-        }
-
-        with patch('sys.stdin', io.StringIO(json.dumps(input_data))):
-            parse_input()
-
-        captured = capsys.readouterr()
-        assert 'HOOK_FILE_PATH="/path/with spaces/\\$var/file.py"' in captured.out
-
-    def test_stop_hook_active_true(self, capsys):
-        input_data = {'stop_hook_active': True}
-
-        with patch('sys.stdin', io.StringIO(json.dumps(input_data))):
-            parse_input()
-
-        captured = capsys.readouterr()
-        assert 'HOOK_STOP_ACTIVE="True"' in captured.out
+    @pytest.mark.parametrize("fixture,expected", [
+        (
+            'complete',
+            {
+                'HOOK_TOOL_NAME': 'Write',
+                'HOOK_FILE_PATH': '/path/to/file.py',
+                'HOOK_CWD': '/project',
+                'HOOK_SESSION_ID': 'abc123',
+                'HOOK_STOP_ACTIVE': 'False',
+                'HOOK_EVENT_NAME': 'PostToolUse',
+            },
+        ),
+        ('empty', {'HOOK_TOOL_NAME': '', 'HOOK_FILE_PATH': '', 'HOOK_SESSION_ID': 'unknown'}),
+        ('invalid_json', {'HOOK_TOOL_NAME': '', 'HOOK_SESSION_ID': 'unknown'}),
+        ('missing_tool_input', {'HOOK_TOOL_NAME': 'Read', 'HOOK_FILE_PATH': ''}),
+        ('tool_input_not_dict', {'HOOK_FILE_PATH': ''}),
+        ('special_chars_in_path', {'HOOK_FILE_PATH': '/path/with spaces/\\$var/file.py'}),
+        ('stop_hook_active', {'HOOK_STOP_ACTIVE': 'True'}),
+    ])
+    def test_parse_input(self, run_parse, fixture, expected):
+        _assert_hooks(run_parse(FIXTURES[fixture]), expected)
+
+
+class TestHookInputFromStdin:
+    """Tests for HookInput.from_stdin, which every Python hook calls first."""
+
+    @pytest.mark.parametrize("fixture,expected", [
+        (
+            'complete',
+            {
+                'tool_name': 'Write',
+                'file_path': '/path/to/file.py',
+                'cwd': '/project',
+                'session_id': 'abc123',
+                'stop_hook_active': False,
+                'hook_event_name': 'PostToolUse',
+                'raw_data': json.loads(FIXTURES['complete']),
+            },
+        ),
+        ('no_input', {'tool_name': '', 'file_path': '', 'session_id': 'unknown', 'raw_data': {}}),
+        ('invalid_json', {'tool_name': '', 'file_path': '', 'session_id': 'unknown', 'raw_data': {}}),
+    ])
+    def test_from_stdin(self, monkeypatch, fixture, expected):
+        monkeypatch.setattr('sys.stdin', io.StringIO(FIXTURES[fixture]))
+        hook_input = HookInput.from_stdin()
+        assert {k: getattr(hook_input, k) for k in expected} == expected
 
 
 class TestBlockResponse:
     """Tests for block_response function."""
 
-    def test_simple_block(self, capsys):
+    def test_simple_block(self, capfd):
         block_response("Cannot proceed")
 
-        captured = capsys.readouterr()
-        output = json.loads(captured.out)
+        assert _json_out(capfd) == {'decision': 'block', 'reason': 'Cannot proceed'}
 
-        assert output['decision'] == 'block'
-        assert output['reason'] == 'Cannot proceed'
-
-    def test_block_with_agent_content(self, capsys):
+    def test_block_with_agent_content(self, capfd):
         block_response("Phase 1 blocked", "\n\n## Agent Instructions\nDo this...")
 
-        captured = capsys.readouterr()
-        output = json.loads(captured.out)
+        output = _json_out(capfd)
 
         assert output['decision'] == 'block'
         assert 'Phase 1 blocked' in output['reason']
         assert '## Agent Instructions' in output['reason']
 
-    def test_block_with_empty_agent_content(self, capsys):
+    def test_block_with_empty_agent_content(self, capfd):
         block_response("Blocked", "")
 
-        captured = capsys.readouterr()
-        output = json.loads(captured.out)
-
-        assert output['reason'] == 'Blocked'
+        assert _json_out(capfd) == {'decision': 'block', 'reason': 'Blocked'}
 
-    def test_block_with_none_agent_content(self, capsys):
+    def test_block_with_none_agent_content(self, capfd):
         block_response("Blocked", None)
 
-        captured = capsys.readouterr()
-        output = json.loads(captured.out)
+        assert _json_out(capfd) == {'decision': 'block', 'reason': 'Blocked'}
 
-        assert output['reason'] == 'Blocked'
-
-    def test_block_output_is_valid_json(self, capsys):
+    def test_block_output_is_valid_json(self, capfd):
         block_response("Test with special chars: \"quotes\" and $vars")
 
-        captured = capsys.readouterr()
         # Should not raise
-        output = json.loads(captured.out)
+        output = _json_out(capfd)
         assert 'decision' in output
 
 
 class TestApproveResponse:
     """Tests for approve_response function."""
 
-    def test_approve_produces_no_output(self, capsys):
+    def test_approve_produces_no_output(self, capfd):
         approve_response()
 
-        captured = capsys.readouterr()
+        captured = capfd.readouterr()
         assert captured.out == ''
 
 
 class TestApproveWithMessage:
     """Tests for approve_with_message function."""
 
-    def test_approve_with_context(self, capsys):
+    def test_approve_with_context(self, capfd):
         approve_with_message(
             "Compilation failed",
             "PostToolUse",
             "## Error Details\n\nFix the errors."
         )
 
-        captured = capsys.readouterr()
-        output = json.loads(captured.out)
+        output = _json_out(capfd)
 
         assert output['decision'] == 'approve'
         assert output['reason'] == 'Compilation failed'
         assert output['hookSpecificOutput']['hookEventName'] == 'PostToolUse'
         assert '## Error Details' in output['hookSpecificOutput']['additionalContext']
 
-    def test_approve_with_empty_context(self, capsys):
+    def test_approve_with_empty_context(self, capfd):
         approve_with_message("Info", "PreToolUse", "")
 
-        captured = capsys.readouterr()
-        output = json.loads(captured.out)
+        output = _json_out(capfd)
 
         assert output['decision'] == 'approve'
         assert output['hookSpecificOutput']['additionalContext'] == ''
 
-    def test_output_structure(self, capsys):
+    def test_output_structure(self, capfd):
         approve_with_message("reason", "event", "context")
 
-        captured = capsys.readouterr()
-        output = json.loads(captured.out)
+        output = _json_out(capfd)
 
         # Verify complete structure
         assert set(output.keys()) == {'decision', 'reason', 'hookSpecificOutput'}
@@ -237,69 +302,52 @@ class TestApproveWithMessage:
 class TestMainCLI:
     """Tests for the CLI interface."""
 
-    def test_parse_command(self, capsys):
-        input_data = {'tool_name': 'Edit', 'session_id': 'test'}
-
-        with patch('sys.stdin', io.StringIO(json.dumps(input_data))):
-            with patch('sys.argv', ['hook_io.py', 'parse']):
-                from hook_io import main
-                main()
-
-        captured = capsys.readouterr()
-        assert 'HOOK_TOOL_NAME="Edit"' in captured.out
-
-    def test_block_command(self, capsys):
-        with patch('sys.argv', ['hook_io.py', 'block', 'Test reason']):
-            from hook_io import main
-            main()
-
-        captured = capsys.readouterr()
-        output = json.loads(captured.out)
-        assert output['decision'] == 'block'
-        assert output['reason'] == 'Test reason'
-
-    def test_block_command_with_agent_content(self, capsys):
-        with patch('sys.argv', ['hook_io.py', 'block', 'Reason', 'Agent content']):
-            from hook_io import main
-            main()
-
-        captured = capsys.readouterr()
-        output = json.loads(captured.out)
-        assert 'Agent content' in output['reason']
-
-    def test_approve_command(self, capsys):
-        with patch('sys.argv', ['hook_io.py', 'approve']):
-            from hook_io import main
+    @pytest.mark.parametrize("argv,check", [
+        (
+            ['hook_io.py', 'parse'],
+            lambda out: _hooks(out)['HOOK_TOOL_NAME'] == 'Edit',
+        ),
+        (
+            ['hook_io.py', 'block', 'Test reason'],
+            lambda out: json.loads(out) == {'decision': 'block', 'reason': 'Test reason'},
+        ),
+        (
+            ['hook_io.py', 'block', 'Reason', 'Agent content'],
+            lambda out: 'Agent content' in json.loads(out)['reason'],
+        ),
+        (
+            ['hook_io.py', 'approve'],
+            lambda out: out == '',
+        ),
+        (
+            ['hook_io.py', 'approve-message', 'reason', 'PostToolUse', 'context'],
+            lambda out: json.loads(out)['decision'] == 'approve',
+        ),
+    ], ids=[
+        "parse",
+        "block",
+        "block_with_agent_content",
+        "approve",
+        "approve_message",
+    ])
+    def test_command_succeeds(self, argv, check, capfd, monkeypatch):
+        monkeypatch.setattr('sys.stdin', io.StringIO(FIXTURES['cli_parse']))
+        monkeypatch.setattr('sys.argv', argv)
+        main()
+
+        captured = capfd.readouterr()
+        assert check(captured.out), captured.out
+
+    @pytest.mark.parametrize("argv", [
+        ['hook_io.py', 'unknown'],
+        ['hook_io.py'],
+    ], ids=[
+        "unknown_command",
+        "no_args",
+    ])
+    def test_command_exits_with_error(self, argv, capfd, monkeypatch):
+        monkeypatch.setattr('sys.argv', argv)
+        with pytest.raises(SystemExit) as exc_info:
             main()
 
-        captured = capsys.readouterr()
-        assert captured.out == ''
-
-    def test_approve_message_command(self, capsys):
-        with patch('sys.argv', ['hook_io.py', 'approve-message', 'reason', 'PostToolUse', 'context']):
-            from hook_io import main
-            main()
-
-        captured = capsys.readouterr()
-        output = json.loads(captured.out)
-        assert output['decision'] == 'approve'
-
-    def test_unknown_command_exits_with_error(self, capsys):
-        with patch('sys.argv', ['hook_io.py', 'unknown']):
-            with pytest.raises(SystemExit) as exc_info:
-                from hook_io import main
-                main()
-
-        assert exc_info.value.code == 1
-
-    def test_no_args_exits_with_error(self, capsys):
-        with patch('sys.argv', ['hook_io.py']):
-            with pytest.raises(SystemExit) as exc_info:
-                from hook_io import main
-                main()
-
         assert exc_info.value.code == 1
-
-
-if __name__ == '__main__':
-    pytest.main([__file__, '-v'])
@@ -5,54 +5,139 @@ Integration tests for Python hooks.
 Tests the hook scripts by simulating Claude Code hook input.
 """
 
+import contextlib
+import functools
+import importlib.util
+import io
 import json
 import os
+import re
+import shutil
+import signal
 import subprocess
 import sys
-import tempfile
 import pytest
 from pathlib import Path
+from types import ModuleType, SimpleNamespace
 from unittest.mock import patch
 
+from hook_io import HookInput
+
 # Get the project root
 PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
 MOCKS_DIR = PROJECT_ROOT / "tests" / "fixtures" / "mocks"
-
-
-def run_hook(hook_name: str, input_data: dict, env: dict = None, use_mocks: bool = False) -> tuple:
+# Kotlin sources, relative to a Maven project
+MAIN_SOURCE = "src/main/kotlin/Service.kt"
+TEST_SOURCE = "src/test/kotlin/ServiceTest.kt"
+
+# Progress lines the compile/test hooks print to stderr
+AUTO_COMPILING = "Auto-compiling"
+RUNNING_CYCLE = "Running compile + test cycle"
+# Agent file names are matched case-insensitively without lowering stderr
+_PHASE1_AGENT_RE = re.compile(r"phase1-agent", re.IGNORECASE)
+_PHASE3_AGENT_RE = re.compile(r"phase3-agent", re.IGNORECASE)
+
+# Deadline for each test; in-process hooks have no subprocess timeout of their own
+HOOK_TIMEOUT_SEC = 30
+
+
+@pytest.fixture(autouse=True)
+def _hook_timeout():
+    """Fail a test whose hook hangs, via SIGALRM where the platform has it."""
+    if not hasattr(signal, "SIGALRM"):
+        yield
+        return
+
+    def expired(signum, frame):
+        pytest.fail(f"test did not finish within {HOOK_TIMEOUT_SEC}s")
+
+    previous = signal.signal(signal.SIGALRM, expired)
+    signal.alarm(HOOK_TIMEOUT_SEC)
+    try:
+        yield
+    finally:
+        signal.alarm(0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+# Hook modules loaded in-process, keyed by hook name
+_HOOK_MODULES: dict = {}
+# hooks/lib module names, re-imported for each hook (see _load_hook)
+_LIB_MODULES = frozenset(p.stem for p in (PROJECT_ROOT / "hooks" / "lib").glob("*.py"))
+
+
+def _load_hook(hook_name: str) -> ModuleType:
+    """Import a hook script once and cache the module."""
+    if hook_name not in _HOOK_MODULES:
+        hook_path = PROJECT_ROOT / "hooks" / f"{hook_name}.py"
+        spec = importlib.util.spec_from_file_location(hook_name, hook_path)
+        module = importlib.util.module_from_spec(spec)
+        # Other test modules stub some lib modules in sys.modules; bind the
+        # hook to the real ones without leaking them back afterwards.
+        with patch.dict(sys.modules):
+            for name in _LIB_MODULES:
+                sys.modules.pop(name, None)
+            spec.loader.exec_module(module)
+        _HOOK_MODULES[hook_name] = module
+    return _HOOK_MODULES[hook_name]
+
+
+def _no_build(*args, **kwargs):
+    # pytest.fail raises a BaseException, which the hooks' "except Exception"
+    # around their build commands does not swallow
+    pytest.fail(f"hook expected to skip ran a build command: {args[0] if args else kwargs}")
+
+
+def run_hook(hook_name: str, input_data: dict, env: dict = None, use_mocks: bool = False,
+             expect_skip: bool = False) -> tuple:
     """
     Run a Python hook script with the given input.
 
+    Hooks are called in-process through their main() entry point, with
+    HookInput.from_stdin() returning input_data directly. The build commands
+    they shell out to inherit the patched environment, so use_mocks only
+    has to put the mocks directory first on PATH. A JSON response on stdout
+    is decoded once here, so tests can assert on it directly.
+
     Args:
         hook_name: Name of the hook script (without .py)
-        input_data: Dict to pass as JSON stdin
+        input_data: Hook input, see generate_hook_input()
         env: Additional environment variables
         use_mocks: If True, add mocks directory to PATH
+        expect_skip: If True, fail as soon as the hook starts a build
+            command, and check that it exited 0 without output
 
-    Returns (exit_code, stdout, stderr)
+    Returns (exit_code, stdout, stderr, response), where response is the
+    decoded JSON object the hook printed, or None if it printed none
     """
-    hook_path = PROJECT_ROOT / "hooks" / f"{hook_name}.py"
-
-    full_env = os.environ.copy()
-    if env:
-        full_env.update(env)
-
-    # Add mocks to PATH if requested
+    env = dict(env or {})
     if use_mocks:
-        full_env["PATH"] = f"{MOCKS_DIR}:{full_env.get('PATH', '')}"
-
-    result = subprocess.run(
-        ["python3", str(hook_path)],
-        input=json.dumps(input_data),
-        capture_output=True,
-        text=True,
-        env=full_env,
-        timeout=30
-    )
-    return result.returncode, result.stdout, result.stderr
-
-
-def setup_mock_compile(tmpdir: str, success: bool = True, output: str = None) -> None:
+        env["PATH"] = f"{MOCKS_DIR}:{env.get('PATH', os.environ.get('PATH', ''))}"
+
+    module = _load_hook(hook_name)
+    stdout, stderr = io.StringIO(), io.StringIO()
+    exit_code = 0
+    cwd = os.getcwd()
+    try:
+        with patch.dict(os.environ, env), \
+                patch.object(module.HookInput, "from_stdin", lambda: module.HookInput.from_dict(input_data)), \
+                (patch.object(subprocess, "run", _no_build) if expect_skip else contextlib.nullcontext()), \
+                contextlib.redirect_stdout(stdout), \
+                contextlib.redirect_stderr(stderr):
+            module.main()
+    except SystemExit as e:
+        exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    finally:
+        # Some hooks chdir into the project directory
+        os.chdir(cwd)
+    out = stdout.getvalue()
+    if expect_skip:
+        assert (exit_code, out) == (0, ""), "hook expected to skip did not exit silently"
+    response = json.loads(out) if out.startswith('{') else None
+    return exit_code, out, stderr.getvalue(), response
+
+
+def setup_mock_compile(tmpdir: Path, success: bool = True, output: str = None) -> None:
     """
     Set up mock compile command behavior.
 
@@ -65,11 +150,11 @@ def setup_mock_compile(tmpdir: str, success: bool = True, output: str = None) ->
     if output is None:
         output = "BUILD SUCCESS" if success else "[ERROR] Compilation failure\nSrc.kt:10: error: unresolved reference: foo"
 
-    Path(tmpdir, "mock_compile_exit_code").write_text(exit_code)
-    Path(tmpdir, "mock_compile_output").write_text(output)
+    Path(tmpdir, "mock_compile_exit_code").write_bytes(exit_code.encode())
+    Path(tmpdir, "mock_compile_output").write_bytes(output.encode())
 
 
-def setup_mock_test(tmpdir: str, success: bool = True, output: str = None) -> None:
+def setup_mock_test(tmpdir: Path, success: bool = True, output: str = None) -> None:
     """
     Set up mock test command behavior.
 
@@ -82,32 +167,20 @@ def setup_mock_test(tmpdir: str, success: bool = True, output: str = None) -> No
     if output is None:
         output = "Tests run: 10, Failures: 0" if success else "Tests run: 10, Failures: 2\n\nFailed tests:\n  - testSomething\n  - testAnother"
 
-    Path(tmpdir, "mock_test_exit_code").write_text(exit_code)
-    Path(tmpdir, "mock_test_output").write_text(output)
+    Path(tmpdir, "mock_test_exit_code").write_bytes(exit_code.encode())
+    Path(tmpdir, "mock_test_output").write_bytes(output.encode())
 
 
-def setup_tdd_state(
-    markers_dir: Path,
-    phase: int = 1,
-    active: bool = True,
-    requirements_complete: bool = False,
-    interfaces_complete: bool = False,
-    tests_complete: bool = False,
-    implementation_complete: bool = False
-) -> None:
-    """
-    Set up TDD state.json file for testing.
-
-    Args:
-        markers_dir: The markers directory path
-        phase: Current TDD phase (1-4)
-        active: Whether TDD mode is active
-        requirements_complete: Whether requirements phase is complete
-        interfaces_complete: Whether interfaces phase is complete
-        tests_complete: Whether tests phase is complete
-        implementation_complete: Whether implementation phase is complete
-    """
-    markers_dir.mkdir(parents=True, exist_ok=True)
+@functools.lru_cache(maxsize=128)
+def _build_state_json(
+    phase: int,
+    active: bool,
+    requirements_complete: bool,
+    interfaces_complete: bool,
+    tests_complete: bool,
+    implementation_complete: bool
+) -> bytes:
+    """Serialize a TDD state.json; cached since tests reuse a few combinations."""
     state = {
         "version": 1,
         "active": active,
@@ -131,7 +204,41 @@ def setup_tdd_state(
             "sessionId": "test-session"
         }
     }
-    (markers_dir / "state.json").write_text(json.dumps(state, indent=2))
+    return json.dumps(state, indent=2).encode()
+
+
+def setup_tdd_state(
+    markers_dir: Path,
+    phase: int = 1,
+    active: bool = True,
+    requirements_complete: bool = False,
+    interfaces_complete: bool = False,
+    tests_complete: bool = False,
+    implementation_complete: bool = False
+) -> None:
+    """
+    Set up TDD state.json file for testing.
+
+    Args:
+        markers_dir: The markers directory path
+        phase: Current TDD phase (1-4)
+        active: Whether TDD mode is active
+        requirements_complete: Whether requirements phase is complete
+        interfaces_complete: Whether interfaces phase is complete
+        tests_complete: Whether tests phase is complete
+        implementation_complete: Whether implementation phase is complete
+    """
+    data = _build_state_json(
+        phase, active, requirements_complete, interfaces_complete,
+        tests_complete, implementation_complete
+    )
+    state_file = markers_dir / "state.json"
+    try:
+        state_file.write_bytes(data)
+    except FileNotFoundError:
+        # Callers without the markers_dir fixture pass a directory not yet created
+        markers_dir.mkdir(parents=True, exist_ok=True)
+        state_file.write_bytes(data)
 
 
 def get_tdd_state(markers_dir: Path) -> dict:
@@ -150,1262 +257,713 @@ def get_tdd_phase(markers_dir: Path) -> int:
     return state.get("phase", 1)
 
 
-def generate_hook_input(
-    tool_name: str = "Write",
-    file_path: str = "/project/src/main.py",
-    cwd: str = "/project",
-    session_id: str = "test-session",
-    hook_event_name: str = "",
-    stop_hook_active: bool = False
-) -> dict:
-    """Generate hook input JSON."""
-    return {
-        "tool_name": tool_name,
-        "tool_input": {"file_path": file_path},
-        "cwd": cwd,
-        "session_id": session_id,
-        "hook_event_name": hook_event_name,
-        "stop_hook_active": stop_hook_active,
-    }
+# Hook input fields other than tool_input, with their defaults
+_HOOK_INPUT_DEFAULTS = {
+    "tool_name": "Write",
+    "cwd": "/project",
+    "session_id": "test-session",
+    "hook_event_name": "",
+    "stop_hook_active": False,
+}
+_DEFAULT_FILE = "/project/src/main.py"
+
+
+def generate_hook_input(file_path: str = _DEFAULT_FILE, **fields) -> dict:
+    """
+    Generate hook input, as the hook would parse it from stdin.
+
+    Args:
+        file_path: tool_input.file_path
+        **fields: Overrides for _HOOK_INPUT_DEFAULTS (tool_name, cwd,
+            session_id, hook_event_name, stop_hook_active)
+    """
+    unknown = fields.keys() - _HOOK_INPUT_DEFAULTS.keys()
+    if unknown:
+        raise TypeError(f"Unknown hook input fields: {sorted(unknown)}")
+    return {**_HOOK_INPUT_DEFAULTS, **fields, "tool_input": {"file_path": file_path}}
+
+
+@pytest.fixture(scope="session")
+def install_dir(tmp_path_factory):
+    """TDD_INSTALL_DIR using the repo's config and agents, with logs kept out of the repo."""
+    d = tmp_path_factory.mktemp("tdd-workflow")
+    for name in ("config", "agents"):
+        (d / name).symlink_to(PROJECT_ROOT / name, target_is_directory=True)
+    return d
+
+
+def _agents_tree(tmp_path_factory, filename, content):
+    d = tmp_path_factory.mktemp("agents-tree")
+    (d / "agents").mkdir()
+    (d / "agents" / filename).write_text(content)
+    return d
+
+
+@pytest.fixture(scope="session")
+def phase1_agents_tree(tmp_path_factory):
+    """Install dir whose only agent is configured for phase 1."""
+    return _agents_tree(tmp_path_factory, "phase1-agent.md", """---
+name: Phase 1 Test Agent
+phases: [1]
+---
+
+# Phase 1 Agent Content
+
+This agent helps with requirements gathering.
+""")
+
+
+@pytest.fixture(scope="session")
+def phase3_agents_tree(tmp_path_factory):
+    """Install dir whose only agent is configured for phase 3."""
+    return _agents_tree(tmp_path_factory, "phase3-agent.md", """---
+name: Phase 3 Only Agent
+phases: [3]
+---
+
+# Phase 3 Agent Content
+
+This agent helps with test writing.
+""")
+
+
+def _link_install_dir(tree, home):
+    # Hooks log under the install dir, so each test gets its own copy;
+    # the agent files themselves are hardlinked from the shared tree
+    d = home / "tdd-workflow"
+    shutil.copytree(tree, d, copy_function=os.link)
+    return d
+
+
+@pytest.fixture
+def tdd_env(tmp_home, markers_dir, maven_project, install_dir):
+    """A Maven project, its session markers directory and the env to run hooks with."""
+    return SimpleNamespace(
+        home=tmp_home,
+        markers_dir=markers_dir,
+        project_dir=maven_project,
+        env={"HOME": str(tmp_home), "TDD_INSTALL_DIR": str(install_dir)},
+    )
 
 
 class TestCleanupMarkersHook:
     """Tests for tdd-cleanup-markers.py"""
 
-    def test_does_nothing_for_non_session_end(self):
+    def test_does_nothing_for_non_session_end(self, tmp_home):
         """Should do nothing for non-SessionEnd events."""
+        env = {"HOME": str(tmp_home)}
         input_data = generate_hook_input(hook_event_name="Stop")
 
-        exit_code, stdout, stderr = run_hook("tdd-cleanup-markers", input_data)
+        exit_code, stdout, stderr, response = run_hook("tdd-cleanup-markers", input_data, env)
 
         assert exit_code == 0
         assert stdout == ""
+        assert not any(tmp_home.iterdir())
+
+    @pytest.mark.parametrize("phase,flags", [
+        (2, {}),
+        (4, dict(
+            requirements_complete=True,
+            interfaces_complete=True,
+            tests_complete=True,
+            implementation_complete=True
+        )),
+        (1, dict(requirements_complete=True)),
+    ], ids=[
+        "in_progress",
+        "all_phases_complete",
+        "partial_state",
+    ])
+    def test_cleans_up_on_session_end(self, phase, flags, tmp_home, markers_dir):
+        """Should remove the session's markers on SessionEnd, whatever the state."""
+        setup_tdd_state(markers_dir, phase=phase, **flags)
+        assert (markers_dir / "state.json").exists()
+
+        env = {"HOME": str(tmp_home)}
+        input_data = generate_hook_input(
+            hook_event_name="SessionEnd",
+            session_id="test-session"
+        )
+
+        exit_code, stdout, stderr, response = run_hook("tdd-cleanup-markers", input_data, env)
 
-    def test_cleans_up_on_session_end(self):
-        """Should clean up markers on SessionEnd."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create marker directory with markers
-            markers_dir = Path(tmpdir) / ".claude" / "tmp" / "tdd-test-session"
-            markers_dir.mkdir(parents=True)
-            setup_tdd_state(markers_dir, phase=2)
-
-            # Mock home directory
-            env = {"HOME": tmpdir}
-            input_data = generate_hook_input(
-                hook_event_name="SessionEnd",
-                session_id="test-session"
-            )
-
-            exit_code, stdout, stderr = run_hook("tdd-cleanup-markers", input_data, env)
-
-            assert exit_code == 0
-            # Markers should be cleaned up
-            assert not markers_dir.exists()
-
-    def test_cleans_up_all_tdd_state(self):
-        """Should clean up all TDD state on SessionEnd."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            markers_dir = Path(tmpdir) / ".claude" / "tmp" / "tdd-test-session"
-            markers_dir.mkdir(parents=True)
-
-            # Create state with all phases complete
-            setup_tdd_state(
-                markers_dir,
-                phase=4,
-                requirements_complete=True,
-                interfaces_complete=True,
-                tests_complete=True,
-                implementation_complete=True
-            )
-
-            # Verify state exists
-            assert (markers_dir / "state.json").exists()
-
-            env = {"HOME": tmpdir}
-            input_data = generate_hook_input(
-                hook_event_name="SessionEnd",
-                session_id="test-session"
-            )
-
-            exit_code, stdout, stderr = run_hook("tdd-cleanup-markers", input_data, env)
-
-            assert exit_code == 0
-            # Directory should be gone
-            assert not markers_dir.exists()
-
-    def test_handles_missing_markers_gracefully(self):
-        """Should handle missing markers gracefully."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Don't create any markers
-            env = {"HOME": tmpdir}
-            input_data = generate_hook_input(
-                hook_event_name="SessionEnd",
-                session_id="test-session"
-            )
-
-            exit_code, stdout, stderr = run_hook("tdd-cleanup-markers", input_data, env)
-
-            assert exit_code == 0
+        assert exit_code == 0
+        assert not markers_dir.exists()
 
-    def test_handles_partial_state(self):
-        """Should handle partial state (only some phases complete)."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            markers_dir = Path(tmpdir) / ".claude" / "tmp" / "tdd-test-session"
-            markers_dir.mkdir(parents=True)
+    def test_handles_missing_markers_gracefully(self, tmp_home):
+        """Should handle missing markers gracefully."""
+        # Don't create any markers (the logger still writes under HOME)
+        env = {"HOME": str(tmp_home)}
+        input_data = generate_hook_input(
+            hook_event_name="SessionEnd",
+            session_id="test-session"
+        )
 
-            # Create state with only requirements complete
-            setup_tdd_state(markers_dir, phase=1, requirements_complete=True)
+        exit_code, stdout, stderr, response = run_hook("tdd-cleanup-markers", input_data, env)
 
-            env = {"HOME": tmpdir}
-            input_data = generate_hook_input(
-                hook_event_name="SessionEnd",
-                session_id="test-session"
-            )
+        assert exit_code == 0
 
-            exit_code, stdout, stderr = run_hook("tdd-cleanup-markers", input_data, env)
 
-            assert exit_code == 0
-            # All should be gone
-            assert not markers_dir.exists()
+# (phase, path relative to a Maven project, expected decision, reason substring)
+# for tdd-phase-guard.py; a None decision means the edit is allowed.
+PHASE_MATRIX = [
+    (1, MAIN_SOURCE, "block", "Phase 1"),
+    (1, TEST_SOURCE, "block", "Phase 1"),
+    (1, "pom.xml", None, None),
+    (2, MAIN_SOURCE, None, None),
+    (2, TEST_SOURCE, "block", "Phase 2"),
+    (2, "pom.xml", None, None),
+    (3, MAIN_SOURCE, "block", "Phase 3"),
+    (3, TEST_SOURCE, None, None),
+    (3, "application.yaml", None, None),
+    (4, MAIN_SOURCE, None, None),
+    (4, TEST_SOURCE, None, None),
+    (4, "pom.xml", None, None),
+]
 
 
 class TestPhaseGuardHook:
     """Tests for tdd-phase-guard.py"""
 
-    def test_allows_when_tdd_inactive(self):
+    def test_allows_when_tdd_inactive(self, tmp_home, install_dir):
         """Should allow all operations when TDD is not active."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            env = {"HOME": tmpdir, "TDD_INSTALL_DIR": str(PROJECT_ROOT)}
-            input_data = generate_hook_input()
+        env = {"HOME": str(tmp_home), "TDD_INSTALL_DIR": str(install_dir)}
+        input_data = generate_hook_input()
 
-            exit_code, stdout, stderr = run_hook("tdd-phase-guard", input_data, env)
+        exit_code, stdout, stderr, response = run_hook("tdd-phase-guard", input_data, env)
 
-            assert exit_code == 0
-            assert stdout == ""  # Empty output = allow
+        assert exit_code == 0
+        assert stdout == ""  # Empty output = allow
 
-    def test_allows_test_edits_when_tdd_inactive(self):
+    def test_allows_test_edits_when_tdd_inactive(self, tmp_home, maven_project, install_dir):
         """Should allow test file edits when TDD is not active."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            project_dir = Path(tmpdir) / "project"
-            project_dir.mkdir()
-            (project_dir / "pom.xml").write_text("<project></project>")
-
-            env = {"HOME": tmpdir, "TDD_INSTALL_DIR": str(PROJECT_ROOT)}
-            input_data = generate_hook_input(
-                file_path=str(project_dir / "src" / "test" / "kotlin" / "ServiceTest.kt"),
-                cwd=str(project_dir)
-            )
+        env = {"HOME": str(tmp_home), "TDD_INSTALL_DIR": str(install_dir)}
+        input_data = generate_hook_input(
+            file_path=str(maven_project / TEST_SOURCE),
+            cwd=str(maven_project)
+        )
 
-            exit_code, stdout, stderr = run_hook("tdd-phase-guard", input_data, env)
+        exit_code, stdout, stderr, response = run_hook("tdd-phase-guard", input_data, env)
 
-            assert exit_code == 0
-            assert stdout == ""
+        assert exit_code == 0
+        assert stdout == ""
 
-    def test_allows_non_write_edit_tools(self):
+    def test_allows_non_write_edit_tools(self, tmp_home, markers_dir, install_dir):
         """Should allow non-Write/Edit tools."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create TDD mode marker
-            markers_dir = Path(tmpdir) / ".claude" / "tmp" / "tdd-test-session"
-            markers_dir.mkdir(parents=True)
-            setup_tdd_state(markers_dir, phase=1)
+        # Create TDD mode marker
+        setup_tdd_state(markers_dir, phase=1)
 
-            env = {"HOME": tmpdir, "TDD_INSTALL_DIR": str(PROJECT_ROOT)}
-            input_data = generate_hook_input(tool_name="Read")
+        env = {"HOME": str(tmp_home), "TDD_INSTALL_DIR": str(install_dir)}
+        input_data = generate_hook_input(tool_name="Read")
 
-            exit_code, stdout, stderr = run_hook("tdd-phase-guard", input_data, env)
+        exit_code, stdout, stderr, response = run_hook("tdd-phase-guard", input_data, env)
 
-            assert exit_code == 0
-            assert stdout == ""  # Empty output = allow
+        assert exit_code == 0
+        assert stdout == ""  # Empty output = allow
 
-    def test_handles_edit_tool_same_as_write(self):
+    def test_handles_edit_tool_same_as_write(self, tdd_env):
         """Should handle Edit tool same as Write."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            markers_dir = Path(tmpdir) / ".claude" / "tmp" / "tdd-test-session"
-            markers_dir.mkdir(parents=True)
-            setup_tdd_state(markers_dir, phase=1)
-
-            project_dir = Path(tmpdir) / "project"
-            project_dir.mkdir()
-            (project_dir / "pom.xml").write_text("<project></project>")
-
-            env = {"HOME": tmpdir, "TDD_INSTALL_DIR": str(PROJECT_ROOT)}
-            input_data = generate_hook_input(
-                tool_name="Edit",
-                file_path=str(project_dir / "src" / "main" / "kotlin" / "Service.kt"),
-                cwd=str(project_dir)
-            )
-
-            exit_code, stdout, stderr = run_hook("tdd-phase-guard", input_data, env)
-
-            assert exit_code == 0
-            if stdout:
-                response = json.loads(stdout)
-                assert response.get("decision") == "block"
-
-    def test_blocks_source_edit_in_phase_1(self):
-        """Should block source file edits in Phase 1."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create TDD mode marker in phase 1
-            markers_dir = Path(tmpdir) / ".claude" / "tmp" / "tdd-test-session"
-            markers_dir.mkdir(parents=True)
-            setup_tdd_state(markers_dir, phase=1)
-
-            # Create a mock project with pom.xml for profile detection
-            project_dir = Path(tmpdir) / "project"
-            project_dir.mkdir()
-            (project_dir / "pom.xml").write_text("<project></project>")
-
-            env = {"HOME": tmpdir, "TDD_INSTALL_DIR": str(PROJECT_ROOT)}
-            input_data = generate_hook_input(
-                file_path=str(project_dir / "src" / "main" / "kotlin" / "Service.kt"),
-                cwd=str(project_dir)
-            )
-
-            exit_code, stdout, stderr = run_hook("tdd-phase-guard", input_data, env)
-
-            assert exit_code == 0
-            if stdout:  # If there's output, it should be a block
-                response = json.loads(stdout)
-                assert response.get("decision") == "block"
-                assert "Phase 1" in response.get("reason", "")
-
-    def test_phase_1_blocks_test_source_edits(self):
-        """Should block test file edits in Phase 1."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            markers_dir = Path(tmpdir) / ".claude" / "tmp" / "tdd-test-session"
-            markers_dir.mkdir(parents=True)
-            setup_tdd_state(markers_dir, phase=1)
-
-            project_dir = Path(tmpdir) / "project"
-            project_dir.mkdir()
-            (project_dir / "pom.xml").write_text("<project></project>")
-
-            env = {"HOME": tmpdir, "TDD_INSTALL_DIR": str(PROJECT_ROOT)}
-            input_data = generate_hook_input(
-                file_path=str(project_dir / "src" / "test" / "kotlin" / "ServiceTest.kt"),
-                cwd=str(project_dir)
-            )
-
-            exit_code, stdout, stderr = run_hook("tdd-phase-guard", input_data, env)
-
-            assert exit_code == 0
-            if stdout:
-                response = json.loads(stdout)
-                assert response.get("decision") == "block"
-
-    def test_phase_1_allows_config_file_edits(self):
-        """Should allow config file edits in Phase 1."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            markers_dir = Path(tmpdir) / ".claude" / "tmp" / "tdd-test-session"
-            markers_dir.mkdir(parents=True)
-            setup_tdd_state(markers_dir, phase=1)
-
-            project_dir = Path(tmpdir) / "project"
-            project_dir.mkdir()
-            (project_dir / "pom.xml").write_text("<project></project>")
-
-            env = {"HOME": tmpdir, "TDD_INSTALL_DIR": str(PROJECT_ROOT)}
-            input_data = generate_hook_input(
-                file_path=str(project_dir / "pom.xml"),
-                cwd=str(project_dir)
-            )
-
-            exit_code, stdout, stderr = run_hook("tdd-phase-guard", input_data, env)
-
-            assert exit_code == 0
-            # Should not block config files
-            if stdout:
-                response = json.loads(stdout)
-                assert response.get("decision") != "block"
-
-    def test_phase_2_allows_main_source_edits(self):
-        """Should allow main source edits in Phase 2."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            markers_dir = Path(tmpdir) / ".claude" / "tmp" / "tdd-test-session"
-            markers_dir.mkdir(parents=True)
-            setup_tdd_state(markers_dir, phase=2)
-
-            project_dir = Path(tmpdir) / "project"
-            project_dir.mkdir()
-            (project_dir / "pom.xml").write_text("<project></project>")
-
-            env = {"HOME": tmpdir, "TDD_INSTALL_DIR": str(PROJECT_ROOT)}
-            input_data = generate_hook_input(
-                file_path=str(project_dir / "src" / "main" / "kotlin" / "Service.kt"),
-                cwd=str(project_dir)
-            )
-
-            exit_code, stdout, stderr = run_hook("tdd-phase-guard", input_data, env)
-
-            assert exit_code == 0
-            assert stdout == ""  # No output means allowed
+        setup_tdd_state(tdd_env.markers_dir, phase=1)
 
-    def test_phase_2_blocks_test_source_edits(self):
-        """Should block test file edits in Phase 2."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            markers_dir = Path(tmpdir) / ".claude" / "tmp" / "tdd-test-session"
-            markers_dir.mkdir(parents=True)
-            setup_tdd_state(markers_dir, phase=2)
-
-            project_dir = Path(tmpdir) / "project"
-            project_dir.mkdir()
-            (project_dir / "pom.xml").write_text("<project></project>")
-
-            env = {"HOME": tmpdir, "TDD_INSTALL_DIR": str(PROJECT_ROOT)}
-            input_data = generate_hook_input(
-                file_path=str(project_dir / "src" / "test" / "kotlin" / "ServiceTest.kt"),
-                cwd=str(project_dir)
-            )
-
-            exit_code, stdout, stderr = run_hook("tdd-phase-guard", input_data, env)
-
-            assert exit_code == 0
-            if stdout:
-                response = json.loads(stdout)
-                assert response.get("decision") == "block"
-                assert "Phase 2" in response.get("reason", "")
-
-    def test_phase_2_allows_config_file_edits(self):
-        """Should allow config file edits in Phase 2."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            markers_dir = Path(tmpdir) / ".claude" / "tmp" / "tdd-test-session"
-            markers_dir.mkdir(parents=True)
-            setup_tdd_state(markers_dir, phase=2)
-
-            project_dir = Path(tmpdir) / "project"
-            project_dir.mkdir()
-            (project_dir / "pom.xml").write_text("<project></project>")
-
-            env = {"HOME": tmpdir, "TDD_INSTALL_DIR": str(PROJECT_ROOT)}
-            input_data = generate_hook_input(
-                file_path=str(project_dir / "pom.xml"),
-                cwd=str(project_dir)
-            )
-
-            exit_code, stdout, stderr = run_hook("tdd-phase-guard", input_data, env)
-
-            assert exit_code == 0
-            # Should not block config files
-            if stdout:
-                response = json.loads(stdout)
-                assert response.get("decision") != "block"
-
-    def test_phase_3_blocks_main_source_edits(self):
-        """Should block main source edits in Phase 3."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            markers_dir = Path(tmpdir) / ".claude" / "tmp" / "tdd-test-session"
-            markers_dir.mkdir(parents=True)
-            setup_tdd_state(markers_dir, phase=3)
-
-            project_dir = Path(tmpdir) / "project"
-            project_dir.mkdir()
-            (project_dir / "pom.xml").write_text("<project></project>")
-
-            env = {"HOME": tmpdir, "TDD_INSTALL_DIR": str(PROJECT_ROOT)}
-            input_data = generate_hook_input(
-                file_path=str(project_dir / "src" / "main" / "kotlin" / "Service.kt"),
-                cwd=str(project_dir)
-            )
-
-            exit_code, stdout, stderr = run_hook("tdd-phase-guard", input_data, env)
-
-            assert exit_code == 0
-            if stdout:
-                response = json.loads(stdout)
-                assert response.get("decision") == "block"
-                assert "Phase 3" in response.get("reason", "")
-
-    def test_phase_3_allows_test_source_edits(self):
-        """Should allow test file edits in Phase 3."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            markers_dir = Path(tmpdir) / ".claude" / "tmp" / "tdd-test-session"
-            markers_dir.mkdir(parents=True)
-            setup_tdd_state(markers_dir, phase=3)
-
-            project_dir = Path(tmpdir) / "project"
-            project_dir.mkdir()
-            (project_dir / "pom.xml").write_text("<project></project>")
-
-            env = {"HOME": tmpdir, "TDD_INSTALL_DIR": str(PROJECT_ROOT)}
-            input_data = generate_hook_input(
-                file_path=str(project_dir / "src" / "test" / "kotlin" / "ServiceTest.kt"),
-                cwd=str(project_dir)
-            )
-
-            exit_code, stdout, stderr = run_hook("tdd-phase-guard", input_data, env)
-
-            assert exit_code == 0
-            assert stdout == ""  # No output means allowed
+        input_data = generate_hook_input(
+            tool_name="Edit",
+            file_path=str(tdd_env.project_dir / MAIN_SOURCE),
+            cwd=str(tdd_env.project_dir)
+        )
 
-    def test_phase_3_allows_config_file_edits(self):
-        """Should allow config file edits in Phase 3."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            markers_dir = Path(tmpdir) / ".claude" / "tmp" / "tdd-test-session"
-            markers_dir.mkdir(parents=True)
-            setup_tdd_state(markers_dir, phase=3)
-
-            project_dir = Path(tmpdir) / "project"
-            project_dir.mkdir()
-            (project_dir / "pom.xml").write_text("<project></project>")
-
-            env = {"HOME": tmpdir, "TDD_INSTALL_DIR": str(PROJECT_ROOT)}
-            input_data = generate_hook_input(
-                file_path=str(project_dir / "application.yaml"),
-                cwd=str(project_dir)
-            )
-
-            exit_code, stdout, stderr = run_hook("tdd-phase-guard", input_data, env)
-
-            assert exit_code == 0
-            # Should not block config files
-            if stdout:
-                response = json.loads(stdout)
-                assert response.get("decision") != "block"
-
-    def test_phase_4_allows_main_source_edits(self):
-        """Should allow main source edits in Phase 4."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            markers_dir = Path(tmpdir) / ".claude" / "tmp" / "tdd-test-session"
-            markers_dir.mkdir(parents=True)
-            setup_tdd_state(markers_dir, phase=4)
-
-            project_dir = Path(tmpdir) / "project"
-            project_dir.mkdir()
-            (project_dir / "pom.xml").write_text("<project></project>")
-
-            env = {"HOME": tmpdir, "TDD_INSTALL_DIR": str(PROJECT_ROOT)}
-            input_data = generate_hook_input(
-                file_path=str(project_dir / "src" / "main" / "kotlin" / "Service.kt"),
-                cwd=str(project_dir)
-            )
-
-            exit_code, stdout, stderr = run_hook("tdd-phase-guard", input_data, env)
-
-            assert exit_code == 0
-            assert stdout == ""  # No output means allowed
+        exit_code, stdout, stderr, response = run_hook("tdd-phase-guard", input_data, tdd_env.env)
 
-    def test_phase_4_allows_test_source_edits(self):
-        """Should allow test file edits in Phase 4."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            markers_dir = Path(tmpdir) / ".claude" / "tmp" / "tdd-test-session"
-            markers_dir.mkdir(parents=True)
-            setup_tdd_state(markers_dir, phase=4)
+        assert exit_code == 0
+        assert response is not None
+        assert response["decision"] == "block"
 
-            project_dir = Path(tmpdir) / "project"
-            project_dir.mkdir()
-            (project_dir / "pom.xml").write_text("<project></project>")
+    @pytest.mark.parametrize("phase,rel_path,expected_decision,reason_substr", PHASE_MATRIX)
+    def test_phase_guard_decisions(self, phase, rel_path, expected_decision, reason_substr, tdd_env):
+        """Should block or allow each kind of file according to the TDD phase."""
+        setup_tdd_state(tdd_env.markers_dir, phase=phase)
 
-            env = {"HOME": tmpdir, "TDD_INSTALL_DIR": str(PROJECT_ROOT)}
-            input_data = generate_hook_input(
-                file_path=str(project_dir / "src" / "test" / "kotlin" / "ServiceTest.kt"),
-                cwd=str(project_dir)
-            )
+        input_data = generate_hook_input(
+            file_path=str(tdd_env.project_dir / rel_path),
+            cwd=str(tdd_env.project_dir)
+        )
 
-            exit_code, stdout, stderr = run_hook("tdd-phase-guard", input_data, env)
+        exit_code, stdout, stderr, response = run_hook("tdd-phase-guard", input_data, tdd_env.env)
 
-            assert exit_code == 0
+        assert exit_code == 0
+        if expected_decision is None:
             assert stdout == ""  # No output means allowed
+        else:
+            assert response["decision"] == expected_decision
+            assert reason_substr in response["reason"]
 
-    def test_phase_4_allows_config_file_edits(self):
-        """Should allow config file edits in Phase 4."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            markers_dir = Path(tmpdir) / ".claude" / "tmp" / "tdd-test-session"
-            markers_dir.mkdir(parents=True)
-            setup_tdd_state(markers_dir, phase=4)
-
-            project_dir = Path(tmpdir) / "project"
-            project_dir.mkdir()
-            (project_dir / "pom.xml").write_text("<project></project>")
+    def test_typescript_phase_2_blocks_test_files(self, tmp_home, markers_dir, typescript_project, install_dir):
+        """Should block test files for TypeScript project in Phase 2."""
+        setup_tdd_state(markers_dir, phase=2)
 
-            env = {"HOME": tmpdir, "TDD_INSTALL_DIR": str(PROJECT_ROOT)}
-            input_data = generate_hook_input(
-                file_path=str(project_dir / "pom.xml"),
-                cwd=str(project_dir)
-            )
+        env = {"HOME": str(tmp_home), "TDD_INSTALL_DIR": str(install_dir)}
+        input_data = generate_hook_input(
+            file_path=str(typescript_project / "src" / "service.test.ts"),
+            cwd=str(typescript_project)
+        )
 
-            exit_code, stdout, stderr = run_hook("tdd-phase-guard", input_data, env)
+        exit_code, stdout, stderr, response = run_hook("tdd-phase-guard", input_data, env)
 
-            assert exit_code == 0
-            # Should not block config files
-            if stdout:
-                response = json.loads(stdout)
-                assert response.get("decision") != "block"
+        assert exit_code == 0
+        assert response is not None
+        assert response["decision"] == "block"
 
-    def test_typescript_phase_2_blocks_test_files(self):
-        """Should block test files for TypeScript project in Phase 2."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            markers_dir = Path(tmpdir) / ".claude" / "tmp" / "tdd-test-session"
-            markers_dir.mkdir(parents=True)
-            setup_tdd_state(markers_dir, phase=2)
-
-            project_dir = Path(tmpdir) / "project"
-            project_dir.mkdir()
-            (project_dir / "package.json").write_text('{"name": "test"}')
-            (project_dir / "tsconfig.json").write_text('{}')
-
-            env = {"HOME": tmpdir, "TDD_INSTALL_DIR": str(PROJECT_ROOT)}
-            input_data = generate_hook_input(
-                file_path=str(project_dir / "src" / "service.test.ts"),
-                cwd=str(project_dir)
-            )
-
-            exit_code, stdout, stderr = run_hook("tdd-phase-guard", input_data, env)
-
-            assert exit_code == 0
-            if stdout:
-                response = json.loads(stdout)
-                assert response.get("decision") == "block"
-
-    def test_typescript_phase_3_allows_test_files(self):
+    def test_typescript_phase_3_allows_test_files(self, tmp_home, markers_dir, typescript_project, install_dir):
         """Should allow test files for TypeScript project in Phase 3."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            markers_dir = Path(tmpdir) / ".claude" / "tmp" / "tdd-test-session"
-            markers_dir.mkdir(parents=True)
-            setup_tdd_state(markers_dir, phase=3)
+        setup_tdd_state(markers_dir, phase=3)
 
-            project_dir = Path(tmpdir) / "project"
-            project_dir.mkdir()
-            (project_dir / "package.json").write_text('{"name": "test"}')
-            (project_dir / "tsconfig.json").write_text('{}')
+        env = {"HOME": str(tmp_home), "TDD_INSTALL_DIR": str(install_dir)}
+        input_data = generate_hook_input(
+            file_path=str(typescript_project / "src" / "service.test.ts"),
+            cwd=str(typescript_project)
+        )
 
-            env = {"HOME": tmpdir, "TDD_INSTALL_DIR": str(PROJECT_ROOT)}
-            input_data = generate_hook_input(
-                file_path=str(project_dir / "src" / "service.test.ts"),
-                cwd=str(project_dir)
-            )
+        exit_code, stdout, stderr, response = run_hook("tdd-phase-guard", input_data, env)
 
-            exit_code, stdout, stderr = run_hook("tdd-phase-guard", input_data, env)
+        assert exit_code == 0
+        assert stdout == ""  # No output means allowed
 
-            assert exit_code == 0
-            assert stdout == ""  # No output means allowed
+
+@pytest.fixture(scope="session")
+def mock_control(tmp_path_factory):
+    """Factory for shared TEST_TMP dirs holding the canonical mock outputs.
+
+    One directory per (compile_success, test_success) pair is written on
+    first use and reused for the rest of the session; tests must not write
+    to it.
+    """
+    dirs = {}
+
+    def _get(compile_success=True, test_success=True):
+        key = (compile_success, test_success)
+        if key not in dirs:
+            d = tmp_path_factory.mktemp("mock_ctl")
+            setup_mock_compile(d, success=compile_success)
+            setup_mock_test(d, success=test_success)
+            dirs[key] = d
+        return dirs[key]
+
+    return _get
 
 
 class TestAutoCompileHook:
     """Tests for tdd-auto-compile.py"""
 
-    def test_compiles_after_source_file_change_success(self):
+    def test_compiles_after_source_file_change_success(self, mock_control, tmp_home, maven_project, install_dir):
         """Should compile successfully after kotlin source file change."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            project_dir = Path(tmpdir) / "project"
-            project_dir.mkdir()
-            (project_dir / "pom.xml").write_text("<project></project>")
-
-            # Set up mock to succeed
-            setup_mock_compile(tmpdir, success=True)
-
-            env = {
-                "HOME": tmpdir,
-                "TDD_INSTALL_DIR": str(PROJECT_ROOT),
-                "TEST_TMP": tmpdir
-            }
-            input_data = generate_hook_input(
-                file_path=str(project_dir / "src" / "main" / "kotlin" / "Service.kt"),
-                cwd=str(project_dir)
-            )
-
-            exit_code, stdout, stderr = run_hook("tdd-auto-compile", input_data, env, use_mocks=True)
-            assert exit_code == 0
-            assert "Auto-compiling" in stderr
-            assert "Compilation successful" in stderr
-
-    def test_compiles_after_source_file_change_failure(self):
+        env = {
+            "HOME": str(tmp_home),
+            "TDD_INSTALL_DIR": str(install_dir),
+            "TEST_TMP": str(mock_control())
+        }
+        input_data = generate_hook_input(
+            file_path=str(maven_project / MAIN_SOURCE),
+            cwd=str(maven_project)
+        )
+
+        exit_code, stdout, stderr, response = run_hook("tdd-auto-compile", input_data, env, use_mocks=True)
+        assert exit_code == 0
+        assert AUTO_COMPILING in stderr
+        assert "Compilation successful" in stderr
+
+    def test_compiles_after_source_file_change_failure(self, mock_control, tmp_home, maven_project, install_dir):
         """Should handle compilation failure and output error context."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            project_dir = Path(tmpdir) / "project"
-            project_dir.mkdir()
-            (project_dir / "pom.xml").write_text("<project></project>")
-
-            # Set up mock to fail with error output
-            setup_mock_compile(tmpdir, success=False, output="[ERROR] Service.kt:15: unresolved reference: myVar")
-
-            env = {
-                "HOME": tmpdir,
-                "TDD_INSTALL_DIR": str(PROJECT_ROOT),
-                "TEST_TMP": tmpdir
-            }
-            input_data = generate_hook_input(
-                file_path=str(project_dir / "src" / "main" / "kotlin" / "Service.kt"),
-                cwd=str(project_dir)
-            )
-
-            exit_code, stdout, stderr = run_hook("tdd-auto-compile", input_data, env, use_mocks=True)
-            assert exit_code == 0
-            assert "Compilation failed" in stderr
-            # Should output approve with error context
-            if stdout:
-                response = json.loads(stdout)
-                assert response.get("decision") == "approve"
-                assert "Compilation failed" in response.get("reason", "")
-
-    def test_skips_non_source_files(self):
+        env = {
+            "HOME": str(tmp_home),
+            "TDD_INSTALL_DIR": str(install_dir),
+            "TEST_TMP": str(mock_control(compile_success=False))
+        }
+        input_data = generate_hook_input(
+            file_path=str(maven_project / MAIN_SOURCE),
+            cwd=str(maven_project)
+        )
+
+        exit_code, stdout, stderr, response = run_hook("tdd-auto-compile", input_data, env, use_mocks=True)
+        assert exit_code == 0
+        assert "Compilation failed" in stderr
+        # Should output approve with error context
+        assert response is not None
+        assert response["decision"] == "approve"
+        assert "Compilation failed" in response["reason"]
+
+    def test_skips_non_source_files(self, tmp_home, maven_project, install_dir):
         """Should skip non-source files like README."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            project_dir = Path(tmpdir) / "project"
-            project_dir.mkdir()
-            (project_dir / "pom.xml").write_text("<project></project>")
-
-            env = {"HOME": tmpdir, "TDD_INSTALL_DIR": str(PROJECT_ROOT)}
-            input_data = generate_hook_input(
-                file_path=str(project_dir / "README.md"),
-                cwd=str(project_dir)
-            )
-
-            exit_code, stdout, stderr = run_hook("tdd-auto-compile", input_data, env)
-            assert exit_code == 0
-            assert stdout == ""
-            assert "Auto-compiling" not in stderr
-
-    def test_skips_non_write_edit_tools(self):
+        env = {"HOME": str(tmp_home), "TDD_INSTALL_DIR": str(install_dir)}
+        input_data = generate_hook_input(
+            file_path=str(maven_project / "README.md"),
+            cwd=str(maven_project)
+        )
+
+        _, _, stderr, _ = run_hook("tdd-auto-compile", input_data, env, expect_skip=True)
+        assert AUTO_COMPILING not in stderr
+
+    def test_skips_non_write_edit_tools(self, tmp_home, maven_project, install_dir):
         """Should skip non-Write/Edit tools."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            project_dir = Path(tmpdir) / "project"
-            project_dir.mkdir()
-            (project_dir / "pom.xml").write_text("<project></project>")
-
-            env = {"HOME": tmpdir, "TDD_INSTALL_DIR": str(PROJECT_ROOT)}
-            input_data = generate_hook_input(
-                tool_name="Read",
-                file_path=str(project_dir / "src" / "main" / "kotlin" / "Service.kt"),
-                cwd=str(project_dir)
-            )
-
-            exit_code, stdout, stderr = run_hook("tdd-auto-compile", input_data, env)
-            assert exit_code == 0
-            assert stdout == ""
-
-    def test_skips_when_tdd_phase_4_is_active(self):
+        env = {"HOME": str(tmp_home), "TDD_INSTALL_DIR": str(install_dir)}
+        input_data = generate_hook_input(
+            tool_name="Read",
+            file_path=str(maven_project / MAIN_SOURCE),
+            cwd=str(maven_project)
+        )
+
+        run_hook("tdd-auto-compile", input_data, env, expect_skip=True)
+
+    def test_skips_when_tdd_phase_4_is_active(self, tdd_env):
         """Should skip when TDD phase 4 is active (auto-test handles it)."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            markers_dir = Path(tmpdir) / ".claude" / "tmp" / "tdd-test-session"
-            markers_dir.mkdir(parents=True)
-            setup_tdd_state(markers_dir, phase=4)
-
-            project_dir = Path(tmpdir) / "project"
-            project_dir.mkdir()
-            (project_dir / "pom.xml").write_text("<project></project>")
-
-            env = {"HOME": tmpdir, "TDD_INSTALL_DIR": str(PROJECT_ROOT)}
-            input_data = generate_hook_input(
-                file_path=str(project_dir / "src" / "main" / "kotlin" / "Service.kt"),
-                cwd=str(project_dir)
-            )
-
-            exit_code, stdout, stderr = run_hook("tdd-auto-compile", input_data, env)
-            assert exit_code == 0
-            # Should exit without compile output
-            assert "Auto-compiling" not in stderr
-
-    def test_runs_when_tdd_phase_is_not_4(self):
-        """Should run compilation when TDD phase is not 4."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            markers_dir = Path(tmpdir) / ".claude" / "tmp" / "tdd-test-session"
-            markers_dir.mkdir(parents=True)
-            setup_tdd_state(markers_dir, phase=2)
-
-            project_dir = Path(tmpdir) / "project"
-            project_dir.mkdir()
-            (project_dir / "pom.xml").write_text("<project></project>")
-
-            setup_mock_compile(tmpdir, success=True)
-
-            env = {
-                "HOME": tmpdir,
-                "TDD_INSTALL_DIR": str(PROJECT_ROOT),
-                "TEST_TMP": tmpdir
-            }
-            input_data = generate_hook_input(
-                file_path=str(project_dir / "src" / "main" / "kotlin" / "Service.kt"),
-                cwd=str(project_dir)
-            )
-
-            exit_code, stdout, stderr = run_hook("tdd-auto-compile", input_data, env, use_mocks=True)
-            assert exit_code == 0
-            assert "Auto-compiling" in stderr
-
-    def test_runs_when_tdd_mode_is_inactive(self):
-        """Should run compilation when TDD mode is inactive."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            project_dir = Path(tmpdir) / "project"
-            project_dir.mkdir()
-            (project_dir / "pom.xml").write_text("<project></project>")
-
-            setup_mock_compile(tmpdir, success=True)
-
-            env = {
-                "HOME": tmpdir,
-                "TDD_INSTALL_DIR": str(PROJECT_ROOT),
-                "TEST_TMP": tmpdir
-            }
-            input_data = generate_hook_input(
-                file_path=str(project_dir / "src" / "main" / "kotlin" / "Service.kt"),
-                cwd=str(project_dir)
-            )
-
-            exit_code, stdout, stderr = run_hook("tdd-auto-compile", input_data, env, use_mocks=True)
-            assert exit_code == 0
-            assert "Auto-compiling" in stderr
-
-    def test_typescript_compile_success(self):
-        """Should compile TypeScript project successfully."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            project_dir = Path(tmpdir) / "project"
-            project_dir.mkdir()
-            (project_dir / "package.json").write_text('{"name": "test"}')
-            (project_dir / "tsconfig.json").write_text('{}')
-
-            setup_mock_compile(tmpdir, success=True, output="Build completed successfully")
-
-            env = {
-                "HOME": tmpdir,
-                "TDD_INSTALL_DIR": str(PROJECT_ROOT),
-                "TEST_TMP": tmpdir
-            }
-            input_data = generate_hook_input(
-                file_path=str(project_dir / "src" / "service.ts"),
-                cwd=str(project_dir)
-            )
-
-            exit_code, stdout, stderr = run_hook("tdd-auto-compile", input_data, env, use_mocks=True)
-            assert exit_code == 0
-            assert "Auto-compiling" in stderr
-
-    def test_typescript_compile_failure(self):
-        """Should handle TypeScript compilation failure."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            project_dir = Path(tmpdir) / "project"
-            project_dir.mkdir()
-            (project_dir / "package.json").write_text('{"name": "test"}')
-            (project_dir / "tsconfig.json").write_text('{}')
-
-            setup_mock_compile(tmpdir, success=False, output="error TS2304: Cannot find name 'foo'")
-
-            env = {
-                "HOME": tmpdir,
-                "TDD_INSTALL_DIR": str(PROJECT_ROOT),
-                "TEST_TMP": tmpdir
-            }
-            input_data = generate_hook_input(
-                file_path=str(project_dir / "src" / "service.ts"),
-                cwd=str(project_dir)
-            )
-
-            exit_code, stdout, stderr = run_hook("tdd-auto-compile", input_data, env, use_mocks=True)
-            assert exit_code == 0
-            assert "Compilation failed" in stderr
+        setup_tdd_state(tdd_env.markers_dir, phase=4)
+
+        input_data = generate_hook_input(
+            file_path=str(tdd_env.project_dir / MAIN_SOURCE),
+            cwd=str(tdd_env.project_dir)
+        )
+
+        _, _, stderr, _ = run_hook("tdd-auto-compile", input_data, tdd_env.env, expect_skip=True)
+        assert AUTO_COMPILING not in stderr
+
+    @pytest.mark.parametrize("phase", [2, None], ids=["phase_2", "tdd_inactive"])
+    def test_runs_when_not_in_phase_4(self, phase, mock_control, tdd_env):
+        """Should run compilation outside TDD phase 4, including with TDD inactive."""
+        if phase is not None:
+            setup_tdd_state(tdd_env.markers_dir, phase=phase)
+
+        env = {**tdd_env.env, "TEST_TMP": str(mock_control())}
+        input_data = generate_hook_input(
+            file_path=str(tdd_env.project_dir / MAIN_SOURCE),
+            cwd=str(tdd_env.project_dir)
+        )
+
+        exit_code, stdout, stderr, response = run_hook("tdd-auto-compile", input_data, env, use_mocks=True)
+        assert exit_code == 0
+        assert AUTO_COMPILING in stderr
+
+    @pytest.mark.parametrize("success,expected", [
+        (True, AUTO_COMPILING),
+        (False, "Compilation failed"),
+    ], ids=["success", "failure"])
+    def test_typescript_compile(self, success, expected, mock_control, tmp_home, typescript_project, install_dir):
+        """Should compile TypeScript projects and report failures."""
+        env = {
+            "HOME": str(tmp_home),
+            "TDD_INSTALL_DIR": str(install_dir),
+            "TEST_TMP": str(mock_control(compile_success=success))
+        }
+        input_data = generate_hook_input(
+            file_path=str(typescript_project / "src" / "service.ts"),
+            cwd=str(typescript_project)
+        )
+
+        exit_code, stdout, stderr, response = run_hook("tdd-auto-compile", input_data, env, use_mocks=True)
+        assert exit_code == 0
+        assert expected in stderr
 
 
 class TestAutoTestHook:
     """Tests for tdd-auto-test.py"""
 
-    def test_skips_when_tdd_mode_is_inactive(self):
+    def test_skips_when_tdd_mode_is_inactive(self, tmp_home, maven_project, install_dir):
         """Should skip when TDD mode is inactive."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            project_dir = Path(tmpdir) / "project"
-            project_dir.mkdir()
-            (project_dir / "pom.xml").write_text("<project></project>")
-
-            env = {"HOME": tmpdir, "TDD_INSTALL_DIR": str(PROJECT_ROOT)}
-            input_data = generate_hook_input(
-                file_path=str(project_dir / "src" / "main" / "kotlin" / "Service.kt"),
-                cwd=str(project_dir)
-            )
-
-            exit_code, stdout, stderr = run_hook("tdd-auto-test", input_data, env)
-            assert exit_code == 0
-            assert stdout == ""
-
-    def test_skips_when_not_in_phase_4(self):
+        env = {"HOME": str(tmp_home), "TDD_INSTALL_DIR": str(install_dir)}
+        input_data = generate_hook_input(
+            file_path=str(maven_project / MAIN_SOURCE),
+            cwd=str(maven_project)
+        )
+
+        run_hook("tdd-auto-test", input_data, env, expect_skip=True)
+
+    def test_skips_when_not_in_phase_4(self, tdd_env):
         """Should skip when not in phase 4."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            markers_dir = Path(tmpdir) / ".claude" / "tmp" / "tdd-test-session"
-            markers_dir.mkdir(parents=True)
-            setup_tdd_state(markers_dir, phase=2)
-
-            project_dir = Path(tmpdir) / "project"
-            project_dir.mkdir()
-            (project_dir / "pom.xml").write_text("<project></project>")
-
-            env = {"HOME": tmpdir, "TDD_INSTALL_DIR": str(PROJECT_ROOT)}
-            input_data = generate_hook_input(
-                file_path=str(project_dir / "src" / "main" / "kotlin" / "Service.kt"),
-                cwd=str(project_dir)
-            )
-
-            exit_code, stdout, stderr = run_hook("tdd-auto-test", input_data, env)
-            assert exit_code == 0
-            assert stdout == ""
-
-    def test_skips_for_non_write_edit_tools(self):
+        setup_tdd_state(tdd_env.markers_dir, phase=2)
+
+        input_data = generate_hook_input(
+            file_path=str(tdd_env.project_dir / MAIN_SOURCE),
+            cwd=str(tdd_env.project_dir)
+        )
+
+        run_hook("tdd-auto-test", input_data, tdd_env.env, expect_skip=True)
+
+    def test_skips_for_non_write_edit_tools(self, tdd_env):
         """Should skip for non-Write/Edit tools."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            markers_dir = Path(tmpdir) / ".claude" / "tmp" / "tdd-test-session"
-            markers_dir.mkdir(parents=True)
-            setup_tdd_state(markers_dir, phase=4)
-
-            project_dir = Path(tmpdir) / "project"
-            project_dir.mkdir()
-            (project_dir / "pom.xml").write_text("<project></project>")
-
-            env = {"HOME": tmpdir, "TDD_INSTALL_DIR": str(PROJECT_ROOT)}
-            input_data = generate_hook_input(
-                tool_name="Read",
-                file_path=str(project_dir / "src" / "main" / "kotlin" / "Service.kt"),
-                cwd=str(project_dir)
-            )
-
-            exit_code, stdout, stderr = run_hook("tdd-auto-test", input_data, env)
-            assert exit_code == 0
-            assert stdout == ""
-
-    def test_skips_for_non_source_files(self):
+        setup_tdd_state(tdd_env.markers_dir, phase=4)
+
+        input_data = generate_hook_input(
+            tool_name="Read",
+            file_path=str(tdd_env.project_dir / MAIN_SOURCE),
+            cwd=str(tdd_env.project_dir)
+        )
+
+        run_hook("tdd-auto-test", input_data, tdd_env.env, expect_skip=True)
+
+    def test_skips_for_non_source_files(self, tdd_env):
         """Should skip for non-source files."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            markers_dir = Path(tmpdir) / ".claude" / "tmp" / "tdd-test-session"
-            markers_dir.mkdir(parents=True)
-            setup_tdd_state(markers_dir, phase=4)
-
-            project_dir = Path(tmpdir) / "project"
-            project_dir.mkdir()
-            (project_dir / "pom.xml").write_text("<project></project>")
-
-            env = {"HOME": tmpdir, "TDD_INSTALL_DIR": str(PROJECT_ROOT)}
-            input_data = generate_hook_input(
-                file_path=str(project_dir / "README.md"),
-                cwd=str(project_dir)
-            )
-
-            exit_code, stdout, stderr = run_hook("tdd-auto-test", input_data, env)
-            assert exit_code == 0
-            assert stdout == ""
-
-    def test_runs_in_phase_4_for_source_files_success(self):
-        """Should run tests in phase 4 for source file changes - tests pass."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            markers_dir = Path(tmpdir) / ".claude" / "tmp" / "tdd-test-session"
-            markers_dir.mkdir(parents=True)
-            setup_tdd_state(markers_dir, phase=4)
-
-            project_dir = Path(tmpdir) / "project"
-            project_dir.mkdir()
-            (project_dir / "pom.xml").write_text("<project></project>")
-
-            # Set up mocks for both compile and test to succeed
-            setup_mock_compile(tmpdir, success=True)
-            setup_mock_test(tmpdir, success=True)
-
-            env = {
-                "HOME": tmpdir,
-                "TDD_INSTALL_DIR": str(PROJECT_ROOT),
-                "TEST_TMP": tmpdir
-            }
-            input_data = generate_hook_input(
-                file_path=str(project_dir / "src" / "main" / "kotlin" / "Service.kt"),
-                cwd=str(project_dir)
-            )
-
-            exit_code, stdout, stderr = run_hook("tdd-auto-test", input_data, env, use_mocks=True)
-            assert exit_code == 0
-            assert "Running compile + test cycle" in stderr
-            assert "All tests passing" in stderr
-
-    def test_runs_in_phase_4_for_source_files_test_failure(self):
-        """Should handle test failures in phase 4."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            markers_dir = Path(tmpdir) / ".claude" / "tmp" / "tdd-test-session"
-            markers_dir.mkdir(parents=True)
-            setup_tdd_state(markers_dir, phase=4)
-
-            project_dir = Path(tmpdir) / "project"
-            project_dir.mkdir()
-            (project_dir / "pom.xml").write_text("<project></project>")
-
-            # Set up compile to succeed but tests to fail
-            setup_mock_compile(tmpdir, success=True)
-            setup_mock_test(tmpdir, success=False, output="Tests run: 5, Failures: 2\nFailed: testService")
-
-            env = {
-                "HOME": tmpdir,
-                "TDD_INSTALL_DIR": str(PROJECT_ROOT),
-                "TEST_TMP": tmpdir
-            }
-            input_data = generate_hook_input(
-                file_path=str(project_dir / "src" / "main" / "kotlin" / "Service.kt"),
-                cwd=str(project_dir)
-            )
-
-            exit_code, stdout, stderr = run_hook("tdd-auto-test", input_data, env, use_mocks=True)
-            assert exit_code == 0
-            # Should indicate test failure
-            assert "fail" in stderr.lower() or "fail" in stdout.lower()
-
-    def test_runs_in_phase_4_compile_failure(self):
-        """Should handle compile failures in phase 4."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            markers_dir = Path(tmpdir) / ".claude" / "tmp" / "tdd-test-session"
-            markers_dir.mkdir(parents=True)
-            setup_tdd_state(markers_dir, phase=4)
-
-            project_dir = Path(tmpdir) / "project"
-            project_dir.mkdir()
-            (project_dir / "pom.xml").write_text("<project></project>")
-
-            # Set up compile to fail
-            setup_mock_compile(tmpdir, success=False, output="[ERROR] Compilation failed")
-
-            env = {
-                "HOME": tmpdir,
-                "TDD_INSTALL_DIR": str(PROJECT_ROOT),
-                "TEST_TMP": tmpdir
-            }
-            input_data = generate_hook_input(
-                file_path=str(project_dir / "src" / "main" / "kotlin" / "Service.kt"),
-                cwd=str(project_dir)
-            )
-
-            exit_code, stdout, stderr = run_hook("tdd-auto-test", input_data, env, use_mocks=True)
-            assert exit_code == 0
-            # Should indicate compile failure - tests shouldn't run
-            assert "compil" in stderr.lower() or "compil" in stdout.lower()
-
-    def test_runs_for_test_file_changes(self):
+        setup_tdd_state(tdd_env.markers_dir, phase=4)
+
+        input_data = generate_hook_input(
+            file_path=str(tdd_env.project_dir / "README.md"),
+            cwd=str(tdd_env.project_dir)
+        )
+
+        run_hook("tdd-auto-test", input_data, tdd_env.env, expect_skip=True)
+
+    @pytest.mark.parametrize("compile_success,test_success,expected", [
+        (True, True, "All tests passing"),
+        (True, False, "Tests failed"),
+        (False, True, "Compilation failed"),
+    ], ids=["tests_pass", "test_failure", "compile_failure"])
+    def test_runs_in_phase_4_for_source_files(self, compile_success, test_success, expected, mock_control, tdd_env):
+        """Should run the compile + test cycle in phase 4 and report the outcome."""
+        setup_tdd_state(tdd_env.markers_dir, phase=4)
+
+        env = {**tdd_env.env, "TEST_TMP": str(mock_control(compile_success, test_success))}
+        input_data = generate_hook_input(
+            file_path=str(tdd_env.project_dir / MAIN_SOURCE),
+            cwd=str(tdd_env.project_dir)
+        )
+
+        exit_code, stdout, stderr, response = run_hook("tdd-auto-test", input_data, env, use_mocks=True)
+        assert exit_code == 0
+        assert RUNNING_CYCLE in stderr
+        assert expected in stderr
+
+    def test_runs_for_test_file_changes(self, mock_control, tdd_env):
         """Should run for test file changes in phase 4."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            markers_dir = Path(tmpdir) / ".claude" / "tmp" / "tdd-test-session"
-            markers_dir.mkdir(parents=True)
-            setup_tdd_state(markers_dir, phase=4)
-
-            project_dir = Path(tmpdir) / "project"
-            project_dir.mkdir()
-            (project_dir / "pom.xml").write_text("<project></project>")
-
-            setup_mock_compile(tmpdir, success=True)
-            setup_mock_test(tmpdir, success=True)
-
-            env = {
-                "HOME": tmpdir,
-                "TDD_INSTALL_DIR": str(PROJECT_ROOT),
-                "TEST_TMP": tmpdir
-            }
-            input_data = generate_hook_input(
-                file_path=str(project_dir / "src" / "test" / "kotlin" / "ServiceTest.kt"),
-                cwd=str(project_dir)
-            )
-
-            exit_code, stdout, stderr = run_hook("tdd-auto-test", input_data, env, use_mocks=True)
-            assert exit_code == 0
-
-    def test_outputs_approve_with_context_on_test_failure(self):
+        setup_tdd_state(tdd_env.markers_dir, phase=4)
+
+        env = {**tdd_env.env, "TEST_TMP": str(mock_control())}
+        input_data = generate_hook_input(
+            file_path=str(tdd_env.project_dir / TEST_SOURCE),
+            cwd=str(tdd_env.project_dir)
+        )
+
+        exit_code, stdout, stderr, response = run_hook("tdd-auto-test", input_data, env, use_mocks=True)
+        assert exit_code == 0
+
+    def test_outputs_approve_with_context_on_test_failure(self, mock_control, tdd_env):
         """Should output approve decision with error context when tests fail."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            markers_dir = Path(tmpdir) / ".claude" / "tmp" / "tdd-test-session"
-            markers_dir.mkdir(parents=True)
-            setup_tdd_state(markers_dir, phase=4)
-
-            project_dir = Path(tmpdir) / "project"
-            project_dir.mkdir()
-            (project_dir / "pom.xml").write_text("<project></project>")
-
-            setup_mock_compile(tmpdir, success=True)
-            setup_mock_test(tmpdir, success=False, output="Tests run: 3, Failures: 1\nFailed: testSomething")
-
-            env = {
-                "HOME": tmpdir,
-                "TDD_INSTALL_DIR": str(PROJECT_ROOT),
-                "TEST_TMP": tmpdir
-            }
-            input_data = generate_hook_input(
-                file_path=str(project_dir / "src" / "main" / "kotlin" / "Service.kt"),
-                cwd=str(project_dir)
-            )
-
-            exit_code, stdout, stderr = run_hook("tdd-auto-test", input_data, env, use_mocks=True)
-            assert exit_code == 0
-            # Should output approve with context
-            if stdout:
-                response = json.loads(stdout)
-                assert response.get("decision") == "approve"
-                assert "Tests failing" in response.get("reason", "")
-
-    def test_typescript_test_cycle(self):
+        setup_tdd_state(tdd_env.markers_dir, phase=4)
+
+        env = {**tdd_env.env, "TEST_TMP": str(mock_control(test_success=False))}
+        input_data = generate_hook_input(
+            file_path=str(tdd_env.project_dir / MAIN_SOURCE),
+            cwd=str(tdd_env.project_dir)
+        )
+
+        exit_code, stdout, stderr, response = run_hook("tdd-auto-test", input_data, env, use_mocks=True)
+        assert exit_code == 0
+        # Should output approve with context
+        assert response is not None
+        assert response["decision"] == "approve"
+        assert "Tests failing" in response["reason"]
+
+    def test_typescript_test_cycle(self, mock_control, tmp_home, markers_dir, typescript_project, install_dir):
         """Should run compile + test cycle for TypeScript projects."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            markers_dir = Path(tmpdir) / ".claude" / "tmp" / "tdd-test-session"
-            markers_dir.mkdir(parents=True)
-            setup_tdd_state(markers_dir, phase=4)
-
-            project_dir = Path(tmpdir) / "project"
-            project_dir.mkdir()
-            (project_dir / "package.json").write_text('{"name": "test"}')
-            (project_dir / "tsconfig.json").write_text('{}')
-
-            setup_mock_compile(tmpdir, success=True)
-            setup_mock_test(tmpdir, success=True)
-
-            env = {
-                "HOME": tmpdir,
-                "TDD_INSTALL_DIR": str(PROJECT_ROOT),
-                "TEST_TMP": tmpdir
-            }
-            input_data = generate_hook_input(
-                file_path=str(project_dir / "src" / "service.ts"),
-                cwd=str(project_dir)
-            )
-
-            exit_code, stdout, stderr = run_hook("tdd-auto-test", input_data, env, use_mocks=True)
-            assert exit_code == 0
-            assert "Running compile + test cycle" in stderr
+        setup_tdd_state(markers_dir, phase=4)
+
+        env = {
+            "HOME": str(tmp_home),
+            "TDD_INSTALL_DIR": str(install_dir),
+            "TEST_TMP": str(mock_control())
+        }
+        input_data = generate_hook_input(
+            file_path=str(typescript_project / "src" / "service.ts"),
+            cwd=str(typescript_project)
+        )
+
+        exit_code, stdout, stderr, response = run_hook("tdd-auto-test", input_data, env, use_mocks=True)
+        assert exit_code == 0
+        assert RUNNING_CYCLE in stderr
 
 
 class TestOrchestratorHook:
     """Tests for tdd-orchestrator.py"""
 
-    def test_exits_silently_when_tdd_inactive(self):
+    def test_exits_silently_when_tdd_inactive(self, tdd_env):
         """Should exit silently when TDD mode is inactive."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            project_dir = Path(tmpdir) / "project"
-            project_dir.mkdir()
-
-            env = {"HOME": tmpdir, "TDD_INSTALL_DIR": str(PROJECT_ROOT)}
-            input_data = generate_hook_input(
-                cwd=str(project_dir),
-                hook_event_name="Stop"
-            )
+        input_data = generate_hook_input(
+            cwd=str(tdd_env.project_dir),
+            hook_event_name="Stop"
+        )
 
-            exit_code, stdout, stderr = run_hook("tdd-orchestrator", input_data, env)
-            assert exit_code == 0
-            assert stdout == ""
+        exit_code, stdout, stderr, response = run_hook("tdd-orchestrator", input_data, tdd_env.env)
+        assert exit_code == 0
+        assert stdout == ""
 
-    def test_exits_when_stop_hook_active(self):
+    def test_exits_when_stop_hook_active(self, tdd_env):
         """Should exit when stop_hook_active is true to prevent loops."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            markers_dir = Path(tmpdir) / ".claude" / "tmp" / "tdd-test-session"
-            markers_dir.mkdir(parents=True)
-            setup_tdd_state(markers_dir, phase=1)
-
-            project_dir = Path(tmpdir) / "project"
-            project_dir.mkdir()
-
-            env = {"HOME": tmpdir, "TDD_INSTALL_DIR": str(PROJECT_ROOT)}
-            input_data = generate_hook_input(
-                cwd=str(project_dir),
-                hook_event_name="Stop",
-                stop_hook_active=True
-            )
-
-            exit_code, stdout, stderr = run_hook("tdd-orchestrator", input_data, env)
-            assert exit_code == 0
-            assert stdout == ""
-
-    def test_phase_1_blocks_without_requirements_marker(self):
+        setup_tdd_state(tdd_env.markers_dir, phase=1)
+
+        input_data = generate_hook_input(
+            cwd=str(tdd_env.project_dir),
+            hook_event_name="Stop",
+            stop_hook_active=True
+        )
+
+        exit_code, stdout, stderr, response = run_hook("tdd-orchestrator", input_data, tdd_env.env)
+        assert exit_code == 0
+        assert stdout == ""
+
+    def test_phase_1_blocks_without_requirements_marker(self, tdd_env):
         """Should block in phase 1 without requirements marker."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            markers_dir = Path(tmpdir) / ".claude" / "tmp" / "tdd-test-session"
-            markers_dir.mkdir(parents=True)
-            setup_tdd_state(markers_dir, phase=1)
-
-            project_dir = Path(tmpdir) / "project"
-            project_dir.mkdir()
-            (project_dir / "pom.xml").write_text("<project></project>")
-
-            env = {"HOME": tmpdir, "TDD_INSTALL_DIR": str(PROJECT_ROOT)}
-            input_data = generate_hook_input(
-                cwd=str(project_dir),
-                hook_event_name="Stop"
-            )
-
-            exit_code, stdout, stderr = run_hook("tdd-orchestrator", input_data, env)
-            assert exit_code == 0
-            if stdout:
-                response = json.loads(stdout)
-                assert response.get("decision") == "block"
-                assert "Phase 1" in response.get("reason", "")
-
-    def test_phase_1_advances_to_phase_2_with_marker(self):
+        setup_tdd_state(tdd_env.markers_dir, phase=1)
+
+        input_data = generate_hook_input(
+            cwd=str(tdd_env.project_dir),
+            hook_event_name="Stop"
+        )
+
+        exit_code, stdout, stderr, response = run_hook("tdd-orchestrator", input_data, tdd_env.env)
+        assert exit_code == 0
+        assert response is not None
+        assert response["decision"] == "block"
+        assert "Phase 1" in response["reason"]
+
+    def test_phase_1_advances_to_phase_2_with_marker(self, tdd_env):
         """Should advance from phase 1 to phase 2 when requirements are complete."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            markers_dir = Path(tmpdir) / ".claude" / "tmp" / "tdd-test-session"
-            markers_dir.mkdir(parents=True)
-            setup_tdd_state(markers_dir, phase=1, requirements_complete=True)
-
-            project_dir = Path(tmpdir) / "project"
-            project_dir.mkdir()
-            (project_dir / "pom.xml").write_text("<project></project>")
-
-            env = {"HOME": tmpdir, "TDD_INSTALL_DIR": str(PROJECT_ROOT)}
-            input_data = generate_hook_input(
-                cwd=str(project_dir),
-                hook_event_name="Stop"
-            )
-
-            exit_code, stdout, stderr = run_hook("tdd-orchestrator", input_data, env)
-            assert exit_code == 0
-            # Should now be in phase 2
-            assert get_tdd_phase(markers_dir) == 2
-
-    def test_initializes_phase_to_1_if_missing(self):
+        setup_tdd_state(tdd_env.markers_dir, phase=1, requirements_complete=True)
+
+        input_data = generate_hook_input(
+            cwd=str(tdd_env.project_dir),
+            hook_event_name="Stop"
+        )
+
+        exit_code, stdout, stderr, response = run_hook("tdd-orchestrator", input_data, tdd_env.env)
+        assert exit_code == 0
+        # Should now be in phase 2
+        assert get_tdd_phase(tdd_env.markers_dir) == 2
+
+    def test_initializes_phase_to_1_if_missing(self, tdd_env):
         """Should initialize phase to 1 if phase file is missing."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            markers_dir = Path(tmpdir) / ".claude" / "tmp" / "tdd-test-session"
-            markers_dir.mkdir(parents=True)
-            setup_tdd_state(markers_dir, phase=1)
-            # Don't create phase file
-
-            project_dir = Path(tmpdir) / "project"
-            project_dir.mkdir()
-            (project_dir / "pom.xml").write_text("<project></project>")
-
-            env = {"HOME": tmpdir, "TDD_INSTALL_DIR": str(PROJECT_ROOT)}
-            input_data = generate_hook_input(
-                cwd=str(project_dir),
-                hook_event_name="Stop"
-            )
-
-            exit_code, stdout, stderr = run_hook("tdd-orchestrator", input_data, env)
-            assert exit_code == 0
-            # Phase file should be created
-            assert (markers_dir / "state.json").exists()
-
-    def test_handles_no_agents_gracefully(self):
+        setup_tdd_state(tdd_env.markers_dir, phase=1)
+        # Don't create phase file
+
+        input_data = generate_hook_input(
+            cwd=str(tdd_env.project_dir),
+            hook_event_name="Stop"
+        )
+
+        exit_code, stdout, stderr, response = run_hook("tdd-orchestrator", input_data, tdd_env.env)
+        assert exit_code == 0
+        # Phase file should be created
+        assert (tdd_env.markers_dir / "state.json").exists()
+
+    def test_handles_no_agents_gracefully(self, tdd_env):
         """Should handle no agents gracefully."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            markers_dir = Path(tmpdir) / ".claude" / "tmp" / "tdd-test-session"
-            markers_dir.mkdir(parents=True)
-            setup_tdd_state(markers_dir, phase=1)
-
-            project_dir = Path(tmpdir) / "project"
-            project_dir.mkdir()
-            (project_dir / "pom.xml").write_text("<project></project>")
-
-            # Point to non-existent agents directory
-            env = {
-                "HOME": tmpdir,
-                "TDD_INSTALL_DIR": str(Path(tmpdir) / "nonexistent")
-            }
-            input_data = generate_hook_input(
-                cwd=str(project_dir),
-                hook_event_name="Stop"
-            )
-
-            exit_code, stdout, stderr = run_hook("tdd-orchestrator", input_data, env)
-            assert exit_code == 0
-            # Should still show phase 1 guidance
-            if stdout:
-                response = json.loads(stdout)
-                assert response.get("decision") == "block"
-
-    def test_treats_unknown_phase_as_phase_1(self):
+        setup_tdd_state(tdd_env.markers_dir, phase=1)
+
+        # Point to non-existent agents directory
+        env = {
+            "HOME": str(tdd_env.home),
+            "TDD_INSTALL_DIR": str(tdd_env.home / "nonexistent")
+        }
+        input_data = generate_hook_input(
+            cwd=str(tdd_env.project_dir),
+            hook_event_name="Stop"
+        )
+
+        exit_code, stdout, stderr, response = run_hook("tdd-orchestrator", input_data, env)
+        assert exit_code == 0
+        # Should still show phase 1 guidance
+        assert response is not None
+        assert response["decision"] == "block"
+
+    def test_treats_unknown_phase_as_phase_1(self, tdd_env):
         """Should treat unknown phase as phase 1 (blocks until requirements complete)."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            markers_dir = Path(tmpdir) / ".claude" / "tmp" / "tdd-test-session"
-            markers_dir.mkdir(parents=True)
-            setup_tdd_state(markers_dir, phase=99)  # Unknown phase
-
-            project_dir = Path(tmpdir) / "project"
-            project_dir.mkdir()
-            (project_dir / "pom.xml").write_text("<project></project>")
-
-            env = {"HOME": tmpdir, "TDD_INSTALL_DIR": str(PROJECT_ROOT)}
-            input_data = generate_hook_input(
-                cwd=str(project_dir),
-                hook_event_name="Stop"
-            )
-
-            exit_code, stdout, stderr = run_hook("tdd-orchestrator", input_data, env)
-
-            assert exit_code == 0
-            # Should block as if in phase 1
-            if stdout:
-                response = json.loads(stdout)
-                assert response.get("decision") == "block"
-                assert "Phase 1" in response.get("reason", "")
-
-    def test_phase_1_loads_agents_configured_for_phase_1(self):
-        """Should load agents configured for phase 1."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            markers_dir = Path(tmpdir) / ".claude" / "tmp" / "tdd-test-session"
-            markers_dir.mkdir(parents=True)
-            setup_tdd_state(markers_dir, phase=1)
-
-            project_dir = Path(tmpdir) / "project"
-            project_dir.mkdir()
-            (project_dir / "pom.xml").write_text("<project></project>")
-
-            # Create install dir with agents
-            install_dir = Path(tmpdir) / "tdd-workflow"
-            agents_dir = install_dir / "agents"
-            agents_dir.mkdir(parents=True)
-
-            # Create an agent configured for phase 1
-            (agents_dir / "phase1-agent.md").write_text("""---
-name: Phase 1 Test Agent
-phases: [1]
----
+        setup_tdd_state(tdd_env.markers_dir, phase=99)  # Unknown phase
 
-# Phase 1 Agent Content
+        input_data = generate_hook_input(
+            cwd=str(tdd_env.project_dir),
+            hook_event_name="Stop"
+        )
 
-This agent helps with requirements gathering.
-""")
+        exit_code, stdout, stderr, response = run_hook("tdd-orchestrator", input_data, tdd_env.env)
+
+        assert exit_code == 0
+        # Should block as if in phase 1
+        assert response is not None
+        assert response["decision"] == "block"
+        assert "Phase 1" in response["reason"]
+
+    def test_phase_1_loads_agents_configured_for_phase_1(self, phase1_agents_tree, tdd_env):
+        """Should load agents configured for phase 1."""
+        setup_tdd_state(tdd_env.markers_dir, phase=1)
+        install_dir = _link_install_dir(phase1_agents_tree, tdd_env.home)
 
-            env = {"HOME": tmpdir, "TDD_INSTALL_DIR": str(install_dir)}
-            input_data = generate_hook_input(
-                cwd=str(project_dir),
-                hook_event_name="Stop"
-            )
+        env = {"HOME": str(tdd_env.home), "TDD_INSTALL_DIR": str(install_dir)}
+        input_data = generate_hook_input(
+            cwd=str(tdd_env.project_dir),
+            hook_event_name="Stop"
+        )
 
-            exit_code, stdout, stderr = run_hook("tdd-orchestrator", input_data, env)
+        exit_code, stdout, stderr, response = run_hook("tdd-orchestrator", input_data, env)
 
-            assert exit_code == 0
-            # Should mention loaded agent in stderr
-            assert "Phase 1 Test Agent" in stderr or "phase1-agent" in stderr.lower()
+        assert exit_code == 0
+        # Should mention loaded agent in stderr
+        assert "Phase 1 Test Agent" in stderr or _PHASE1_AGENT_RE.search(stderr)
 
-    def test_does_not_load_agents_configured_for_different_phase(self):
+    def test_does_not_load_agents_configured_for_different_phase(self, phase3_agents_tree, tdd_env):
         """Should not load agents configured for different phase."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            markers_dir = Path(tmpdir) / ".claude" / "tmp" / "tdd-test-session"
-            markers_dir.mkdir(parents=True)
-            setup_tdd_state(markers_dir, phase=1)
-
-            project_dir = Path(tmpdir) / "project"
-            project_dir.mkdir()
-            (project_dir / "pom.xml").write_text("<project></project>")
-
-            # Create install dir with agents
-            install_dir = Path(tmpdir) / "tdd-workflow"
-            agents_dir = install_dir / "agents"
-            agents_dir.mkdir(parents=True)
-
-            # Create an agent configured for phase 3 only
-            (agents_dir / "phase3-agent.md").write_text("""---
-name: Phase 3 Only Agent
-phases: [3]
----
+        setup_tdd_state(tdd_env.markers_dir, phase=1)
+        install_dir = _link_install_dir(phase3_agents_tree, tdd_env.home)
 
-# Phase 3 Agent Content
+        env = {"HOME": str(tdd_env.home), "TDD_INSTALL_DIR": str(install_dir)}
+        input_data = generate_hook_input(
+            cwd=str(tdd_env.project_dir),
+            hook_event_name="Stop"
+        )
 
-This agent helps with test writing.
-""")
+        exit_code, stdout, stderr, response = run_hook("tdd-orchestrator", input_data, env)
+
+        assert exit_code == 0
+        # Should NOT mention the phase 3 agent
+        assert "Phase 3 Only Agent" not in stderr
+        assert not _PHASE3_AGENT_RE.search(stderr)
+
+
+class TestHookScript:
+    """Runs a hook script as Claude Code does: a subprocess reading JSON on stdin."""
+
+    def _run_script(self, hook_name, stdin_text, tdd_env):
+        # Started outside the repo with no PYTHONPATH, so the script's own
+        # sys.path bootstrap has to find hooks/lib
+        env = {k: v for k, v in os.environ.items() if k != "PYTHONPATH"}
+        env.update(tdd_env.env)
+        return subprocess.run(
+            [sys.executable, str(PROJECT_ROOT / "hooks" / f"{hook_name}.py")],
+            input=stdin_text,
+            capture_output=True,
+            text=True,
+            cwd=tdd_env.home,
+            env=env,
+            timeout=HOOK_TIMEOUT_SEC,
+        )
+
+    def test_phase_guard_blocks_from_stdin(self, tdd_env):
+        setup_tdd_state(tdd_env.markers_dir, phase=1)
+        input_data = generate_hook_input(
+            file_path=str(tdd_env.project_dir / MAIN_SOURCE),
+            cwd=str(tdd_env.project_dir)
+        )
 
-            env = {"HOME": tmpdir, "TDD_INSTALL_DIR": str(install_dir)}
-            input_data = generate_hook_input(
-                cwd=str(project_dir),
-                hook_event_name="Stop"
-            )
+        result = self._run_script("tdd-phase-guard", json.dumps(input_data), tdd_env)
 
-            exit_code, stdout, stderr = run_hook("tdd-orchestrator", input_data, env)
+        assert result.returncode == 0, result.stderr
+        assert json.loads(result.stdout)["decision"] == "block"
 
-            assert exit_code == 0
-            # Should NOT mention the phase 3 agent
-            assert "Phase 3 Only Agent" not in stderr
-            assert "phase3-agent" not in stderr.lower()
+    def test_phase_guard_allows_on_invalid_stdin(self, tdd_env):
+        setup_tdd_state(tdd_env.markers_dir, phase=1)
+
+        result = self._run_script("tdd-phase-guard", "not valid json", tdd_env)
+
+        assert (result.returncode, result.stdout) == (0, ""), result.stderr
 
 
 class TestHookIO:
     """Tests for hook_io.py HookInput class."""
 
     def test_hook_input_from_dict(self):
-        sys.path.insert(0, str(PROJECT_ROOT / "hooks" / "lib"))
-        from hook_io import HookInput
-
         data = {
             "tool_name": "Write",
             "tool_input": {"file_path": "/test/path.py"},
@@ -1425,9 +983,6 @@ class TestHookIO:
         assert hook.hook_event_name == "PreToolUse"
 
     def test_hook_input_handles_missing_fields(self):
-        sys.path.insert(0, str(PROJECT_ROOT / "hooks" / "lib"))
-        from hook_io import HookInput
-
         hook = HookInput.from_dict({})
 
         assert hook.tool_name == ""
@@ -1435,7 +990,3 @@ class TestHookIO:
         assert hook.cwd == ""
         assert hook.session_id == "unknown"
         assert hook.stop_hook_active is False
-
-
-if __name__ == '__main__':
-    pytest.main([__file__, '-v'])
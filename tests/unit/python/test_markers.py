@@ -3,240 +3,149 @@
 Unit tests for markers.py - MarkerManager class
 """
 
-import os
-import sys
-import tempfile
 import pytest
-from pathlib import Path
-from unittest.mock import patch
 
-# Add hooks/lib to path
-sys.path.insert(0, 'hooks/lib')
 from markers import MarkerManager
 
+# Placeholder in parametrized env for the test's supervisor markers directory
+SUPERVISOR_DIR = object()
+
+
+@pytest.fixture(autouse=True)
+def _no_supervisor_env(monkeypatch):
+    # Tests may run from inside a supervised session; keep its env out
+    monkeypatch.delenv("TDD_SUPERVISOR_ACTIVE", raising=False)
+    monkeypatch.delenv("TDD_SUPERVISOR_MARKERS_DIR", raising=False)
+
+
+@pytest.fixture
+def manager(patched_home):
+    """MarkerManager for 'test-session' under a temporary home."""
+    return MarkerManager("test-session")
+
+
+@pytest.fixture(scope="module")
+def _shared_manager(shared_home):
+    return MarkerManager("test-session")
+
+
+@pytest.fixture
+def ro_manager(_shared_manager, read_only_home):
+    """MarkerManager shared by a module's read-only tests; fails if a test writes state."""
+    return _shared_manager
+
 
 class TestMarkerManager:
     """Tests for MarkerManager class."""
 
-    def test_init_creates_markers_dir(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            with patch.object(Path, 'home', return_value=Path(tmpdir)):
-                manager = MarkerManager("test-session")
-                assert manager.markers_dir.exists()
-                assert "tdd-test-session" in str(manager.markers_dir)
-
-    def test_is_tdd_active_false_when_not_initialized(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            with patch.object(Path, 'home', return_value=Path(tmpdir)):
-                manager = MarkerManager("test-session")
-                assert manager.is_tdd_active() is False
-
-    def test_is_tdd_active_true_after_initialize(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            with patch.object(Path, 'home', return_value=Path(tmpdir)):
-                manager = MarkerManager("test-session")
-                manager._state.initialize()
-                assert manager.is_tdd_active() is True
-
-    def test_get_phase_defaults_to_1(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            with patch.object(Path, 'home', return_value=Path(tmpdir)):
-                manager = MarkerManager("test-session")
-                assert manager.get_phase() == 1
-
-    def test_set_and_get_phase(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            with patch.object(Path, 'home', return_value=Path(tmpdir)):
-                manager = MarkerManager("test-session")
-                manager.set_phase(3)
-                assert manager.get_phase() == 3
-
-    def test_phase_exists_false_when_not_initialized(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            with patch.object(Path, 'home', return_value=Path(tmpdir)):
-                manager = MarkerManager("test-session")
-                assert manager.phase_exists() is False
-
-    def test_phase_exists_true_after_initialize(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            with patch.object(Path, 'home', return_value=Path(tmpdir)):
-                manager = MarkerManager("test-session")
-                manager._state.initialize()
-                assert manager.phase_exists() is True
+    def test_init_creates_markers_dir(self, ro_manager):
+        assert ro_manager.markers_dir.exists()
+        assert "tdd-test-session" in str(ro_manager.markers_dir)
+
+    def test_is_tdd_active_false_when_not_initialized(self, ro_manager):
+        assert ro_manager.is_tdd_active() is False
+
+    def test_is_tdd_active_true_after_initialize(self, manager):
+        manager._state.initialize()
+        assert manager.is_tdd_active() is True
+
+    def test_get_phase_defaults_to_1(self, ro_manager):
+        assert ro_manager.get_phase() == 1
+
+    @pytest.mark.parametrize("phase", [1, 2, 3, 4])
+    def test_set_and_get_phase(self, manager, phase):
+        manager.set_phase(phase)
+        assert manager.get_phase() == phase
+
+    def test_phase_exists_false_when_not_initialized(self, ro_manager):
+        assert ro_manager.phase_exists() is False
+
+    def test_phase_exists_true_after_initialize(self, manager):
+        manager._state.initialize()
+        assert manager.phase_exists() is True
 
 
 class TestPhaseCompletion:
     """Tests for phase completion methods."""
 
-    def test_requirements_complete_false_by_default(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            with patch.object(Path, 'home', return_value=Path(tmpdir)):
-                manager = MarkerManager("test-session")
-                assert manager.is_requirements_complete() is False
-
-    def test_mark_requirements_complete(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            with patch.object(Path, 'home', return_value=Path(tmpdir)):
-                manager = MarkerManager("test-session")
-                manager.mark_requirements_complete()
-                assert manager.is_requirements_complete() is True
-
-    def test_mark_requirements_incomplete(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            with patch.object(Path, 'home', return_value=Path(tmpdir)):
-                manager = MarkerManager("test-session")
-                manager.mark_requirements_complete()
-                manager.mark_requirements_incomplete()
-                assert manager.is_requirements_complete() is False
-
-    def test_interfaces_complete_cycle(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            with patch.object(Path, 'home', return_value=Path(tmpdir)):
-                manager = MarkerManager("test-session")
-                assert manager.is_interfaces_complete() is False
-                manager.mark_interfaces_complete()
-                assert manager.is_interfaces_complete() is True
-                manager.mark_interfaces_incomplete()
-                assert manager.is_interfaces_complete() is False
-
-    def test_tests_complete_cycle(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            with patch.object(Path, 'home', return_value=Path(tmpdir)):
-                manager = MarkerManager("test-session")
-                assert manager.is_tests_complete() is False
-                manager.mark_tests_complete()
-                assert manager.is_tests_complete() is True
-                manager.mark_tests_incomplete()
-                assert manager.is_tests_complete() is False
-
-    def test_implementation_complete_cycle(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            with patch.object(Path, 'home', return_value=Path(tmpdir)):
-                manager = MarkerManager("test-session")
-                assert manager.is_implementation_complete() is False
-                manager.mark_implementation_complete()
-                assert manager.is_implementation_complete() is True
-                manager.mark_implementation_incomplete()
-                assert manager.is_implementation_complete() is False
+    @pytest.mark.parametrize("phase", ["requirements", "interfaces", "tests", "implementation"])
+    def test_complete_cycle(self, manager, phase):
+        is_complete = getattr(manager, f"is_{phase}_complete")
+        assert is_complete() is False
+        getattr(manager, f"mark_{phase}_complete")()
+        assert is_complete() is True
+        getattr(manager, f"mark_{phase}_incomplete")()
+        assert is_complete() is False
 
 
 class TestCleanup:
     """Tests for cleanup methods."""
 
-    def test_cleanup_session(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            with patch.object(Path, 'home', return_value=Path(tmpdir)):
-                manager = MarkerManager("test-session")
-                manager._state.initialize()
-                manager.set_phase(2)
-                manager.mark_requirements_complete()
-
-                manager.cleanup_session()
-
-                assert not manager.markers_dir.exists()
-
-    def test_cleanup_workflow_state(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            with patch.object(Path, 'home', return_value=Path(tmpdir)):
-                manager = MarkerManager("test-session")
-                manager._state.initialize()
-                manager.set_phase(3)
-                manager.mark_requirements_complete()
-                manager.mark_interfaces_complete()
-                manager.mark_implementation_complete()
-
-                manager.cleanup_workflow_state()
-
-                # Directory should still exist
-                assert manager.markers_dir.exists()
-                # State should be reset
-                assert manager.is_tdd_active() is False
-                assert manager.get_phase() == 1
-                assert manager.is_requirements_complete() is False
-                assert manager.is_interfaces_complete() is False
-                # Implementation stays complete as success indicator
-                assert manager.is_implementation_complete() is True
-
-    def test_get_marker_dir_display(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            with patch.object(Path, 'home', return_value=Path(tmpdir)):
-                manager = MarkerManager("abc123")
-                display = manager.get_marker_dir_display()
-                assert display == "~/.claude/tmp/tdd-abc123"
+    def test_cleanup_session(self, manager):
+        manager._state.initialize()
+        manager.set_phase(2)
+        manager.mark_requirements_complete()
+
+        manager.cleanup_session()
+
+        assert not manager.markers_dir.exists()
+
+    def test_cleanup_workflow_state(self, manager):
+        manager._state.initialize()
+        manager.set_phase(3)
+        manager.mark_requirements_complete()
+        manager.mark_interfaces_complete()
+        manager.mark_implementation_complete()
+
+        manager.cleanup_workflow_state()
+
+        # Directory should still exist
+        assert manager.markers_dir.exists()
+        # State should be reset
+        assert manager.is_tdd_active() is False
+        assert manager.get_phase() == 1
+        assert manager.is_requirements_complete() is False
+        assert manager.is_interfaces_complete() is False
+        # Implementation stays complete as success indicator
+        assert manager.is_implementation_complete() is True
+
+    def test_get_marker_dir_display(self, ro_manager):
+        display = ro_manager.get_marker_dir_display()
+        assert display == "~/.claude/tmp/tdd-test-session"
 
 
 class TestSupervisorMode:
     """Tests for supervisor mode functionality."""
 
-    def test_is_supervisor_mode_false_by_default(self):
-        """Supervisor mode should be false when no env vars set."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            with patch.object(Path, 'home', return_value=Path(tmpdir)):
-                env = os.environ.copy()
-                env.pop("TDD_SUPERVISOR_ACTIVE", None)
-                env.pop("TDD_SUPERVISOR_MARKERS_DIR", None)
-
-                with patch.dict(os.environ, env, clear=True):
-                    manager = MarkerManager("test-session")
-                    assert manager.is_supervisor_mode() is False
-
-    def test_is_supervisor_mode_true_with_active_env_var(self):
-        """Supervisor mode should be true when TDD_SUPERVISOR_ACTIVE=1."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            with patch.object(Path, 'home', return_value=Path(tmpdir)):
-                with patch.dict(os.environ, {"TDD_SUPERVISOR_ACTIVE": "1"}):
-                    manager = MarkerManager("test-session")
-                    assert manager.is_supervisor_mode() is True
-
-    def test_is_supervisor_mode_true_with_markers_dir_env_var(self):
-        """Supervisor mode should be true when TDD_SUPERVISOR_MARKERS_DIR is set."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            with patch.object(Path, 'home', return_value=Path(tmpdir)):
-                supervisor_dir = Path(tmpdir) / "supervisor-markers"
-                supervisor_dir.mkdir(parents=True)
-
-                with patch.dict(os.environ, {"TDD_SUPERVISOR_MARKERS_DIR": str(supervisor_dir)}, clear=False):
-                    manager = MarkerManager("test-session")
-                    assert manager.is_supervisor_mode() is True
-
-    def test_init_uses_supervisor_dir_when_env_set(self):
-        """MarkerManager should use supervisor's marker directory when env var set."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            with patch.object(Path, 'home', return_value=Path(tmpdir)):
-                supervisor_dir = Path(tmpdir) / "custom-supervisor-dir"
-                supervisor_dir.mkdir(parents=True)
-
-                with patch.dict(os.environ, {"TDD_SUPERVISOR_MARKERS_DIR": str(supervisor_dir)}, clear=False):
-                    manager = MarkerManager("test-session")
-                    assert manager.markers_dir == supervisor_dir
-
-    def test_init_uses_session_dir_when_no_supervisor_env(self):
-        """MarkerManager should use session-based directory when not in supervisor mode."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            with patch.object(Path, 'home', return_value=Path(tmpdir)):
-                env = os.environ.copy()
-                env.pop("TDD_SUPERVISOR_MARKERS_DIR", None)
-                env.pop("TDD_SUPERVISOR_ACTIVE", None)
-
-                with patch.dict(os.environ, env, clear=True):
-                    manager = MarkerManager("my-session")
-                    assert "tdd-my-session" in str(manager.markers_dir)
-
-    def test_supervisor_mode_markers_shared(self):
+    @pytest.mark.parametrize("env,is_supervisor,uses_supervisor_dir", [
+        ({}, False, False),
+        ({"TDD_SUPERVISOR_ACTIVE": "1"}, True, False),
+        ({"TDD_SUPERVISOR_MARKERS_DIR": SUPERVISOR_DIR}, True, True),
+    ], ids=["no_env", "active_env_var", "markers_dir_env_var"])
+    def test_supervisor_env(self, env, is_supervisor, uses_supervisor_dir, patched_home, monkeypatch):
+        """Supervisor env vars select supervisor mode and the markers directory."""
+        supervisor_dir = patched_home / "supervisor-markers"
+        for name, value in env.items():
+            if value is SUPERVISOR_DIR:
+                value = str(supervisor_dir)
+            monkeypatch.setenv(name, value)
+
+        manager = MarkerManager("test-session")
+        assert manager.is_supervisor_mode() is is_supervisor
+        assert manager.markers_dir.is_dir()
+        if uses_supervisor_dir:
+            assert manager.markers_dir == supervisor_dir
+        else:
+            assert manager.markers_dir == patched_home / ".claude" / "tmp" / "tdd-test-session"
+
+    def test_supervisor_mode_markers_shared(self, patched_home, monkeypatch):
         """Multiple MarkerManagers in supervisor mode should share the same directory."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            with patch.object(Path, 'home', return_value=Path(tmpdir)):
-                supervisor_dir = Path(tmpdir) / "shared-supervisor-dir"
-                supervisor_dir.mkdir(parents=True)
-
-                with patch.dict(os.environ, {"TDD_SUPERVISOR_MARKERS_DIR": str(supervisor_dir)}, clear=False):
-                    manager1 = MarkerManager("session-1")
-                    manager2 = MarkerManager("session-2")
-
-                    # Both should use the same supervisor directory
-                    assert manager1.markers_dir == manager2.markers_dir
-                    assert manager1.markers_dir == supervisor_dir
+        supervisor_dir = patched_home / "shared-supervisor-dir"
+        monkeypatch.setenv("TDD_SUPERVISOR_MARKERS_DIR", str(supervisor_dir))
 
+        manager1 = MarkerManager("session-1")
+        manager2 = MarkerManager("session-2")
 
-if __name__ == '__main__':
-    pytest.main([__file__, '-v'])
+        # Both should use the same supervisor directory
+        assert manager1.markers_dir == manager2.markers_dir
+        assert manager1.markers_dir == supervisor_dir
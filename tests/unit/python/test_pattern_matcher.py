@@ -7,8 +7,6 @@ import sys
 import pytest
 from unittest.mock import patch
 
-# Add hooks/lib to path
-sys.path.insert(0, 'hooks/lib')
 from pattern_matcher import glob_to_regex, matches_pattern, matches_any, main
 
 
@@ -134,7 +132,3 @@ class TestMainCLI:
             with pytest.raises(SystemExit) as exc_info:
                 main()
             assert exc_info.value.code == 2
-
-
-if __name__ == '__main__':
-    pytest.main([__file__, '-v'])
@@ -11,8 +11,6 @@ import pytest
 from pathlib import Path
 from unittest.mock import patch
 
-# Add hooks/lib to path
-sys.path.insert(0, 'hooks/lib')
 from profile_detector import get_override, detect_profile, main
 
 
@@ -234,7 +232,3 @@ class TestMainCLI:
             with pytest.raises(SystemExit) as exc_info:
                 main()
             assert exc_info.value.code == 1
-
-
-if __name__ == '__main__':
-    pytest.main([__file__, '-v'])
@@ -7,33 +7,71 @@ Tests the settings.json management functions for install/uninstall.
 
 import json
 import os
-import sys
-import tempfile
+import stat
 import pytest
 from unittest.mock import patch
 
-# Add the hooks/lib directory to the path
-sys.path.insert(0, 'hooks/lib')
 from settings_manager import (
     TDD_PERMISSIONS,
     get_tdd_hooks,
     atomic_write,
     validate_settings,
+    merge_tdd_settings,
     add_tdd_settings,
     remove_tdd_settings,
+    main,
 )
 
 
+# Hooks for install dir '/install/dir', shared by tests that only read them
+REFERENCE_HOOKS = get_tdd_hooks('/install/dir')
+PHASE_GUARD_CMD = REFERENCE_HOOKS['PreToolUse'][0]['hooks'][0]['command']
+
+# settings.json seeds, serialized once at import
+SEED_EMPTY = b'{}'
+SEED_VALID = b'{"valid": "json"}'
+SEED_OTHER_SETTINGS = json.dumps({
+    'model': 'claude-3',
+    'customKey': {'nested': 'value'}
+}).encode()
+SEED_TDD_STOP_HOOK = json.dumps({
+    'hooks': {
+        'Stop': [{'hooks': [{'command': 'python3 tdd-orchestrator.py'}]}]
+    }
+}).encode()
+
+
+@pytest.fixture
+def write_settings(tmp_path):
+    """Factory writing the given seed bytes to a per-test settings.json."""
+    def _write(seed: bytes):
+        p = tmp_path / 'settings.json'
+        p.write_bytes(seed)
+        return p
+    return _write
+
+
+@pytest.fixture
+def run_with_seed(write_settings):
+    """Seed settings.json, call fn(path, *args) on it and return the parsed result."""
+    def _run(seed: bytes, fn, *args):
+        p = write_settings(seed)
+        fn(str(p), *args)
+        return json.loads(p.read_bytes())
+    return _run
+
+
+@pytest.fixture
+def empty_settings(write_settings):
+    """settings.json containing an empty object."""
+    return write_settings(SEED_EMPTY)
+
+
 class TestGetTddHooks:
     """Tests for get_tdd_hooks function."""
 
     def test_returns_all_hook_events(self):
-        hooks = get_tdd_hooks('/install/dir')
-
-        assert 'PreToolUse' in hooks
-        assert 'PostToolUse' in hooks
-        assert 'Stop' in hooks
-        assert 'SessionEnd' in hooks
+        assert set(REFERENCE_HOOKS) == {'PreToolUse', 'PostToolUse', 'Stop', 'SessionEnd'}
 
     def test_uses_install_dir_in_commands(self):
         hooks = get_tdd_hooks('/custom/path')
@@ -42,31 +80,24 @@ class TestGetTddHooks:
         assert '/custom/path/hooks/tdd-phase-guard.py' in pre_tool_cmd
 
     def test_pre_tool_use_has_correct_matcher(self):
-        hooks = get_tdd_hooks('/dir')
-
-        assert hooks['PreToolUse'][0]['matcher'] == 'Write|Edit'
+        assert REFERENCE_HOOKS['PreToolUse'][0]['matcher'] == 'Write|Edit'
 
     def test_post_tool_use_has_two_hooks(self):
-        hooks = get_tdd_hooks('/dir')
-
-        assert len(hooks['PostToolUse']) == 2
-
-    def test_stop_hook_has_orchestrator(self):
-        hooks = get_tdd_hooks('/dir')
-
-        cmd = hooks['Stop'][0]['hooks'][0]['command']
-        assert 'tdd-orchestrator.py' in cmd
-
-    def test_session_end_has_cleanup(self):
-        hooks = get_tdd_hooks('/dir')
-
-        cmd = hooks['SessionEnd'][0]['hooks'][0]['command']
-        assert 'tdd-cleanup-markers.py' in cmd
+        assert len(REFERENCE_HOOKS['PostToolUse']) == 2
+
+    @pytest.mark.parametrize("event,index,script", [
+        ('PreToolUse', 0, 'tdd-phase-guard.py'),
+        ('PostToolUse', 0, 'tdd-auto-compile.py'),
+        ('PostToolUse', 1, 'tdd-auto-test.py'),
+        ('Stop', 0, 'tdd-orchestrator.py'),
+        ('SessionEnd', 0, 'tdd-cleanup-markers.py'),
+    ])
+    def test_event_runs_hook_script(self, event, index, script):
+        cmd = REFERENCE_HOOKS[event][index]['hooks'][0]['command']
+        assert cmd.endswith(f'/hooks/{script}')
 
     def test_hooks_have_timeouts(self):
-        hooks = get_tdd_hooks('/dir')
-
-        for event, hook_list in hooks.items():
+        for event, hook_list in REFERENCE_HOOKS.items():
             for hook_config in hook_list:
                 for hook in hook_config['hooks']:
                     assert 'timeout' in hook
@@ -76,521 +107,333 @@ class TestGetTddHooks:
 class TestAtomicWrite:
     """Tests for atomic_write function."""
 
-    def test_writes_json_to_file(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            filepath = os.path.join(tmpdir, 'test.json')
-            data = {'key': 'value'}
+    def test_writes_json_to_file(self, tmp_path):
+        filepath = tmp_path / 'test.json'
+        data = {'key': 'value'}
+
+        atomic_write(str(filepath), data)
+
+        result = json.loads(filepath.read_bytes())
+        assert result == data
 
-            atomic_write(filepath, data)
+    def test_overwrites_existing_file(self, tmp_path):
+        filepath = tmp_path / 'test.json'
 
-            with open(filepath) as f:
-                result = json.load(f)
-            assert result == data
+        # Write initial data
+        filepath.write_bytes(b'{"old": "data"}')
 
-    def test_overwrites_existing_file(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            filepath = os.path.join(tmpdir, 'test.json')
+        # Atomic write new data
+        atomic_write(str(filepath), {'new': 'data'})
 
-            # Write initial data
-            with open(filepath, 'w') as f:
-                json.dump({'old': 'data'}, f)
+        result = json.loads(filepath.read_bytes())
+        assert result == {'new': 'data'}
 
-            # Atomic write new data
-            atomic_write(filepath, {'new': 'data'})
+    def test_writes_formatted_json(self, tmp_path):
+        filepath = tmp_path / 'test.json'
 
-            with open(filepath) as f:
-                result = json.load(f)
-            assert result == {'new': 'data'}
+        atomic_write(str(filepath), {'key': 'value'})
 
-    def test_writes_formatted_json(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            filepath = os.path.join(tmpdir, 'test.json')
+        content = filepath.read_text()
+        # Should be indented (not single line)
+        assert '\n' in content
 
-            atomic_write(filepath, {'key': 'value'})
+    def test_no_temp_file_left_behind(self, tmp_path):
+        filepath = tmp_path / 'test.json'
 
-            with open(filepath) as f:
-                content = f.read()
-            # Should be indented (not single line)
-            assert '\n' in content
+        atomic_write(str(filepath), {'key': 'value'})
 
-    def test_no_temp_file_left_behind(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            filepath = os.path.join(tmpdir, 'test.json')
+        files = os.listdir(tmp_path)
+        assert files == ['test.json']
 
-            atomic_write(filepath, {'key': 'value'})
+    def test_fsyncs_file_then_directory(self, tmp_path, monkeypatch):
+        synced = []
+        real_fsync = os.fsync
 
-            files = os.listdir(tmpdir)
-            assert files == ['test.json']
+        def fsync(fd):
+            synced.append(stat.S_ISDIR(os.fstat(fd).st_mode))
+            real_fsync(fd)
+
+        monkeypatch.setattr(os, 'fsync', fsync)
+
+        atomic_write(str(tmp_path / 'test.json'), {'key': 'value'})
+
+        # Temp file before the rename, then the parent directory
+        assert synced == [False, True]
 
 
 class TestValidateSettings:
     """Tests for validate_settings function."""
 
-    def test_valid_json_returns_true(self):
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump({'valid': 'json'}, f)
-            filepath = f.name
+    def test_valid_json_returns_true(self, write_settings):
+        filepath = write_settings(SEED_VALID)
 
-        try:
-            assert validate_settings(filepath) is True
-        finally:
-            os.unlink(filepath)
+        assert validate_settings(str(filepath)) is True
 
-    def test_invalid_json_returns_false(self):
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            f.write('not valid json {')
-            filepath = f.name
+    def test_invalid_json_returns_false(self, write_settings):
+        filepath = write_settings(b'not valid json {')
 
-        try:
-            assert validate_settings(filepath) is False
-        finally:
-            os.unlink(filepath)
+        assert validate_settings(str(filepath)) is False
 
     def test_missing_file_returns_false(self):
         assert validate_settings('/nonexistent/path.json') is False
 
-    def test_empty_file_returns_false(self):
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            filepath = f.name
+    def test_empty_file_returns_false(self, tmp_path):
+        filepath = tmp_path / 'settings.json'
+        filepath.touch()
 
-        try:
-            assert validate_settings(filepath) is False
-        finally:
-            os.unlink(filepath)
+        assert validate_settings(str(filepath)) is False
 
 
-class TestAddTddSettings:
-    """Tests for add_tdd_settings function."""
-
-    def test_adds_permissions_to_empty_settings(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            filepath = os.path.join(tmpdir, 'settings.json')
-            with open(filepath, 'w') as f:
-                json.dump({}, f)
-
-            add_tdd_settings(filepath, '/install/dir')
+class TestMergeTddSettings:
+    """Tests for merge_tdd_settings function."""
 
-            with open(filepath) as f:
-                result = json.load(f)
+    def test_updates_and_returns_same_dict(self):
+        settings = {}
 
-            assert 'permissions' in result
-            assert 'allow' in result['permissions']
-            for perm in TDD_PERMISSIONS:
-                assert perm in result['permissions']['allow']
+        assert merge_tdd_settings(settings, '/install/dir') is settings
 
-    def test_adds_hooks_to_empty_settings(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            filepath = os.path.join(tmpdir, 'settings.json')
-            with open(filepath, 'w') as f:
-                json.dump({}, f)
-
-            add_tdd_settings(filepath, '/install/dir')
+    def test_adds_permissions_to_empty_settings(self):
+        settings = {}
 
-            with open(filepath) as f:
-                result = json.load(f)
+        merge_tdd_settings(settings, '/install/dir')
 
-            assert 'hooks' in result
-            assert 'PreToolUse' in result['hooks']
-            assert 'PostToolUse' in result['hooks']
-            assert 'Stop' in result['hooks']
-            assert 'SessionEnd' in result['hooks']
+        assert 'permissions' in settings
+        assert 'allow' in settings['permissions']
+        for perm in TDD_PERMISSIONS:
+            assert perm in settings['permissions']['allow']
 
     def test_preserves_existing_permissions(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            filepath = os.path.join(tmpdir, 'settings.json')
-            with open(filepath, 'w') as f:
-                json.dump({
-                    'permissions': {
-                        'allow': ['Bash(git:*)']
-                    }
-                }, f)
+        settings = {
+            'permissions': {
+                'allow': ['Bash(git:*)']
+            }
+        }
 
-            add_tdd_settings(filepath, '/install/dir')
+        merge_tdd_settings(settings, '/install/dir')
 
-            with open(filepath) as f:
-                result = json.load(f)
-
-            assert 'Bash(git:*)' in result['permissions']['allow']
+        assert 'Bash(git:*)' in settings['permissions']['allow']
 
     def test_preserves_existing_hooks(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            filepath = os.path.join(tmpdir, 'settings.json')
-            with open(filepath, 'w') as f:
-                json.dump({
-                    'hooks': {
-                        'PreToolUse': [{
-                            'matcher': 'Bash',
-                            'hooks': [{'type': 'command', 'command': 'echo test'}]
-                        }]
-                    }
-                }, f)
-
-            add_tdd_settings(filepath, '/install/dir')
-
-            with open(filepath) as f:
-                result = json.load(f)
-
-            # Should have both existing and new hooks
-            pre_tool_hooks = result['hooks']['PreToolUse']
-            commands = [h['hooks'][0]['command'] for h in pre_tool_hooks]
-            assert 'echo test' in commands
-            assert any('tdd-phase-guard' in cmd for cmd in commands)
+        settings = {
+            'hooks': {
+                'PreToolUse': [{
+                    'matcher': 'Bash',
+                    'hooks': [{'type': 'command', 'command': 'echo test'}]
+                }]
+            }
+        }
+
+        merge_tdd_settings(settings, '/install/dir')
+
+        # Should have both existing and new hooks
+        pre_tool_hooks = settings['hooks']['PreToolUse']
+        commands = [h['hooks'][0]['command'] for h in pre_tool_hooks]
+        assert 'echo test' in commands
+        assert PHASE_GUARD_CMD in commands
 
     def test_does_not_duplicate_hooks(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            filepath = os.path.join(tmpdir, 'settings.json')
-            with open(filepath, 'w') as f:
-                json.dump({}, f)
-
-            # Add twice
-            add_tdd_settings(filepath, '/install/dir')
-            add_tdd_settings(filepath, '/install/dir')
-
-            with open(filepath) as f:
-                result = json.load(f)
-
-            # Should only have one of each TDD hook
-            pre_tool_hooks = result['hooks']['PreToolUse']
-            phase_guard_count = sum(
-                1 for h in pre_tool_hooks
-                if 'tdd-phase-guard' in h['hooks'][0]['command']
-            )
-            assert phase_guard_count == 1
-
-    def test_does_not_duplicate_permissions(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            filepath = os.path.join(tmpdir, 'settings.json')
-            with open(filepath, 'w') as f:
-                json.dump({}, f)
-
-            # Add twice
-            add_tdd_settings(filepath, '/install/dir')
-            add_tdd_settings(filepath, '/install/dir')
+        settings = {}
 
-            with open(filepath) as f:
-                result = json.load(f)
+        # Add twice
+        merge_tdd_settings(settings, '/install/dir')
+        merge_tdd_settings(settings, '/install/dir')
 
-            # Count occurrences of first TDD permission
-            count = result['permissions']['allow'].count(TDD_PERMISSIONS[0])
-            assert count == 1
+        # Should only have one of each TDD hook
+        commands = [h['hooks'][0]['command'] for h in settings['hooks']['PreToolUse']]
+        assert commands.count(PHASE_GUARD_CMD) == 1
 
-    def test_preserves_other_settings(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            filepath = os.path.join(tmpdir, 'settings.json')
-            with open(filepath, 'w') as f:
-                json.dump({
-                    'model': 'claude-3',
-                    'customKey': {'nested': 'value'}
-                }, f)
-
-            add_tdd_settings(filepath, '/install/dir')
+    def test_does_not_duplicate_permissions(self):
+        settings = {}
 
-            with open(filepath) as f:
-                result = json.load(f)
+        # Add twice
+        merge_tdd_settings(settings, '/install/dir')
+        merge_tdd_settings(settings, '/install/dir')
 
-            assert result['model'] == 'claude-3'
-            assert result['customKey'] == {'nested': 'value'}
+        # Count occurrences of first TDD permission
+        count = settings['permissions']['allow'].count(TDD_PERMISSIONS[0])
+        assert count == 1
 
     def test_preserves_complex_nested_structures(self):
         """Should preserve complex nested structures like deny permissions."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            filepath = os.path.join(tmpdir, 'settings.json')
-            with open(filepath, 'w') as f:
-                json.dump({
-                    'model': 'claude-3-opus',
-                    'permissions': {
-                        'allow': ['Bash(git:*)'],
-                        'deny': ['Bash(rm -rf:*)']
-                    },
-                    'hooks': {
-                        'PreToolUse': [{
-                            'matcher': 'Read',
-                            'hooks': [{'type': 'command', 'command': 'echo read', 'timeout': 1000}]
-                        }]
-                    },
-                    'customSettings': {
-                        'nested': {
-                            'deeply': {
-                                'value': 42
-                            }
-                        }
+        settings = {
+            'model': 'claude-3-opus',
+            'permissions': {
+                'allow': ['Bash(git:*)'],
+                'deny': ['Bash(rm -rf:*)']
+            },
+            'hooks': {
+                'PreToolUse': [{
+                    'matcher': 'Read',
+                    'hooks': [{'type': 'command', 'command': 'echo read', 'timeout': 1000}]
+                }]
+            },
+            'customSettings': {
+                'nested': {
+                    'deeply': {
+                        'value': 42
                     }
-                }, f)
+                }
+            }
+        }
 
-            add_tdd_settings(filepath, '/install/dir')
+        merge_tdd_settings(settings, '/install/dir')
 
-            with open(filepath) as f:
-                result = json.load(f)
-
-            # Verify complex structure preserved
-            assert result['customSettings']['nested']['deeply']['value'] == 42
-            # Verify deny preserved
-            assert 'Bash(rm -rf:*)' in result['permissions']['deny']
-            # Verify model preserved
-            assert result['model'] == 'claude-3-opus'
-            # Verify existing hook preserved
-            assert any('echo read' in str(h) for h in result['hooks']['PreToolUse'])
+        # Verify complex structure preserved
+        assert settings['customSettings']['nested']['deeply']['value'] == 42
+        # Verify deny preserved
+        assert 'Bash(rm -rf:*)' in settings['permissions']['deny']
+        # Verify model preserved
+        assert settings['model'] == 'claude-3-opus'
+        # Verify existing hook preserved
+        assert any('echo read' in str(h) for h in settings['hooks']['PreToolUse'])
 
     def test_hook_structure_is_correct(self):
         """Should create hooks with correct structure including matchers and timeouts."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            filepath = os.path.join(tmpdir, 'settings.json')
-            with open(filepath, 'w') as f:
-                json.dump({}, f)
-
-            add_tdd_settings(filepath, '/install/dir')
-
-            with open(filepath) as f:
-                result = json.load(f)
-
-            # Verify PreToolUse hook structure
-            pre_tool_hook = result['hooks']['PreToolUse'][0]
-            assert pre_tool_hook['matcher'] == 'Write|Edit'
-            assert pre_tool_hook['hooks'][0]['type'] == 'command'
-            assert 'tdd-phase-guard.py' in pre_tool_hook['hooks'][0]['command']
-            assert pre_tool_hook['hooks'][0]['timeout'] == 5000
-
-            # Verify PostToolUse auto-compile hook structure
-            post_tool_compile = result['hooks']['PostToolUse'][0]
-            assert post_tool_compile['matcher'] == 'Write|Edit'
-            assert 'tdd-auto-compile.py' in post_tool_compile['hooks'][0]['command']
-            assert post_tool_compile['hooks'][0]['timeout'] == 120000
-
-            # Verify PostToolUse auto-test hook structure
-            post_tool_test = result['hooks']['PostToolUse'][1]
-            assert post_tool_test['matcher'] == 'Write|Edit'
-            assert 'tdd-auto-test.py' in post_tool_test['hooks'][0]['command']
-            assert post_tool_test['hooks'][0]['timeout'] == 300000
-
-            # Verify Stop hook structure (no matcher)
-            stop_hook = result['hooks']['Stop'][0]
-            assert 'matcher' not in stop_hook
-            assert 'tdd-orchestrator.py' in stop_hook['hooks'][0]['command']
-            assert stop_hook['hooks'][0]['timeout'] == 120000
-
-            # Verify SessionEnd hook structure (no matcher)
-            session_end_hook = result['hooks']['SessionEnd'][0]
-            assert 'matcher' not in session_end_hook
-            assert 'tdd-cleanup-markers.py' in session_end_hook['hooks'][0]['command']
-            assert session_end_hook['hooks'][0]['timeout'] == 5000
-
-    def test_fails_gracefully_on_invalid_json(self):
-        """Should raise error on invalid JSON file."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            filepath = os.path.join(tmpdir, 'settings.json')
-            with open(filepath, 'w') as f:
-                f.write('not valid json')
+        settings = {}
+
+        merge_tdd_settings(settings, '/install/dir')
+
+        # Verify PreToolUse hook structure
+        pre_tool_hook = settings['hooks']['PreToolUse'][0]
+        assert pre_tool_hook['matcher'] == 'Write|Edit'
+        assert pre_tool_hook['hooks'][0]['type'] == 'command'
+        assert 'tdd-phase-guard.py' in pre_tool_hook['hooks'][0]['command']
+        assert pre_tool_hook['hooks'][0]['timeout'] == 5000
+
+        # Verify PostToolUse auto-compile hook structure
+        post_tool_compile = settings['hooks']['PostToolUse'][0]
+        assert post_tool_compile['matcher'] == 'Write|Edit'
+        assert 'tdd-auto-compile.py' in post_tool_compile['hooks'][0]['command']
+        assert post_tool_compile['hooks'][0]['timeout'] == 120000
+
+        # Verify PostToolUse auto-test hook structure
+        post_tool_test = settings['hooks']['PostToolUse'][1]
+        assert post_tool_test['matcher'] == 'Write|Edit'
+        assert 'tdd-auto-test.py' in post_tool_test['hooks'][0]['command']
+        assert post_tool_test['hooks'][0]['timeout'] == 300000
+
+        # Verify Stop hook structure (no matcher)
+        stop_hook = settings['hooks']['Stop'][0]
+        assert 'matcher' not in stop_hook
+        assert 'tdd-orchestrator.py' in stop_hook['hooks'][0]['command']
+        assert stop_hook['hooks'][0]['timeout'] == 120000
+
+        # Verify SessionEnd hook structure (no matcher)
+        session_end_hook = settings['hooks']['SessionEnd'][0]
+        assert 'matcher' not in session_end_hook
+        assert 'tdd-cleanup-markers.py' in session_end_hook['hooks'][0]['command']
+        assert session_end_hook['hooks'][0]['timeout'] == 5000
 
-            with pytest.raises(json.JSONDecodeError):
-                add_tdd_settings(filepath, '/install/dir')
 
+class TestAddTddSettings:
+    """Tests for add_tdd_settings function."""
 
-class TestRemoveTddSettings:
-    """Tests for remove_tdd_settings function."""
+    def test_adds_hooks_to_empty_settings(self, run_with_seed):
+        result = run_with_seed(SEED_EMPTY, add_tdd_settings, '/install/dir')
 
-    def test_removes_tdd_permissions(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            filepath = os.path.join(tmpdir, 'settings.json')
-            with open(filepath, 'w') as f:
-                json.dump({
-                    'permissions': {
-                        'allow': [
-                            'Bash(git:*)',
-                            'Bash(mkdir -p ~/.claude/tmp:*)',
-                            'Bash(touch ~/.claude/tmp/:*)',
-                        ]
-                    }
-                }, f)
-
-            remove_tdd_settings(filepath)
-
-            with open(filepath) as f:
-                result = json.load(f)
-
-            # Should keep non-TDD permissions
-            assert 'Bash(git:*)' in result['permissions']['allow']
-            # Should remove TDD permissions
-            assert 'Bash(mkdir -p ~/.claude/tmp:*)' not in result['permissions']['allow']
-
-    def test_removes_tdd_hooks(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            filepath = os.path.join(tmpdir, 'settings.json')
-            with open(filepath, 'w') as f:
-                json.dump({
-                    'hooks': {
-                        'PreToolUse': [
-                            {
-                                'matcher': 'Bash',
-                                'hooks': [{'command': 'echo test'}]
-                            },
-                            {
-                                'matcher': 'Write|Edit',
-                                'hooks': [{'command': 'python3 /path/tdd-phase-guard.py'}]
-                            }
-                        ]
-                    }
-                }, f)
-
-            remove_tdd_settings(filepath)
-
-            with open(filepath) as f:
-                result = json.load(f)
-
-            # Should keep non-TDD hooks
-            pre_tool_hooks = result['hooks']['PreToolUse']
-            assert len(pre_tool_hooks) == 1
-            assert pre_tool_hooks[0]['hooks'][0]['command'] == 'echo test'
-
-    def test_removes_empty_hook_events(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            filepath = os.path.join(tmpdir, 'settings.json')
-            with open(filepath, 'w') as f:
-                json.dump({
-                    'hooks': {
-                        'PreToolUse': [
-                            {
-                                'matcher': 'Write|Edit',
-                                'hooks': [{'command': 'python3 /path/tdd-phase-guard.py'}]
-                            }
-                        ],
-                        'Stop': [
-                            {
-                                'hooks': [{'command': 'python3 /path/tdd-orchestrator.py'}]
-                            }
-                        ]
-                    }
-                }, f)
+        assert result['hooks'] == REFERENCE_HOOKS
 
-            remove_tdd_settings(filepath)
+    def test_preserves_other_settings(self, run_with_seed):
+        result = run_with_seed(SEED_OTHER_SETTINGS, add_tdd_settings, '/install/dir')
+
+        assert result['model'] == 'claude-3'
+        assert result['customKey'] == {'nested': 'value'}
+
+    def test_fails_gracefully_on_invalid_json(self, write_settings):
+        """Should raise error on invalid JSON file."""
+        filepath = write_settings(b'not valid json')
+
+        with pytest.raises(json.JSONDecodeError):
+            add_tdd_settings(str(filepath), '/install/dir')
+
+
+# (id, seed, settings.json after remove_tdd_settings)
+REMOVE_CASES = [
+    ("removes_tdd_permissions",
+     {'permissions': {'allow': [
+         'Bash(git:*)',
+         'Bash(mkdir -p ~/.claude/tmp:*)',
+         'Bash(touch ~/.claude/tmp/:*)',
+     ]}},
+     {'permissions': {'allow': ['Bash(git:*)']}}),
+    ("removes_tdd_hooks",
+     {'hooks': {'PreToolUse': [
+         {'matcher': 'Bash', 'hooks': [{'command': 'echo test'}]},
+         {'matcher': 'Write|Edit', 'hooks': [{'command': 'python3 /path/tdd-phase-guard.py'}]},
+     ]}},
+     {'hooks': {'PreToolUse': [
+         {'matcher': 'Bash', 'hooks': [{'command': 'echo test'}]},
+     ]}}),
+    ("removes_empty_hook_events",
+     {'hooks': {
+         'PreToolUse': [{'matcher': 'Write|Edit', 'hooks': [{'command': 'python3 /path/tdd-phase-guard.py'}]}],
+         'Stop': [{'hooks': [{'command': 'python3 /path/tdd-orchestrator.py'}]}],
+     }},
+     {'hooks': {}}),
+    ("preserves_other_settings",
+     {'model': 'claude-3', 'permissions': {'allow': []}, 'hooks': {}},
+     {'model': 'claude-3', 'permissions': {'allow': []}, 'hooks': {}}),
+    ("handles_missing_permissions",
+     {'model': 'claude-3'},
+     {'model': 'claude-3'}),
+    ("handles_missing_hooks",
+     {'permissions': {'allow': []}},
+     {'permissions': {'allow': []}}),
+]
 
-            with open(filepath) as f:
-                result = json.load(f)
 
-            # Empty events should be removed
-            assert 'PreToolUse' not in result['hooks']
-            assert 'Stop' not in result['hooks']
+class TestRemoveTddSettings:
+    """Tests for remove_tdd_settings function."""
 
-    def test_preserves_other_settings(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            filepath = os.path.join(tmpdir, 'settings.json')
-            with open(filepath, 'w') as f:
-                json.dump({
-                    'model': 'claude-3',
-                    'permissions': {'allow': []},
-                    'hooks': {}
-                }, f)
+    @pytest.mark.parametrize("seed,expected", [
+        pytest.param(json.dumps(seed).encode(), expected, id=case_id)
+        for case_id, seed, expected in REMOVE_CASES
+    ])
+    def test_remove(self, seed, expected, run_with_seed):
+        assert run_with_seed(seed, remove_tdd_settings) == expected
 
-            remove_tdd_settings(filepath)
 
-            with open(filepath) as f:
-                result = json.load(f)
+class TestMainCLI:
+    """Tests for the CLI interface."""
 
-            assert result['model'] == 'claude-3'
+    def test_validate_command_valid_file(self, capsys, write_settings):
+        filepath = write_settings(SEED_VALID)
 
-    def test_handles_missing_permissions(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            filepath = os.path.join(tmpdir, 'settings.json')
-            with open(filepath, 'w') as f:
-                json.dump({'model': 'claude-3'}, f)
+        assert main(['validate', str(filepath)]) == 0
 
-            # Should not raise
-            remove_tdd_settings(filepath)
+        captured = capsys.readouterr()
+        assert 'valid' in captured.out.lower()
 
-            with open(filepath) as f:
-                result = json.load(f)
-            assert result['model'] == 'claude-3'
+    def test_validate_command_invalid_file(self, capsys, write_settings):
+        filepath = write_settings(b'not json')
 
-    def test_handles_missing_hooks(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            filepath = os.path.join(tmpdir, 'settings.json')
-            with open(filepath, 'w') as f:
-                json.dump({'permissions': {'allow': []}}, f)
+        assert main(['validate', str(filepath)]) == 1
 
-            # Should not raise
-            remove_tdd_settings(filepath)
+    def test_add_command(self, capsys, empty_settings):
+        assert main(['add', str(empty_settings), '/install/dir']) == 0
 
+        result = json.loads(empty_settings.read_bytes())
+        assert 'hooks' in result
 
-class TestMainCLI:
-    """Tests for the CLI interface."""
+    def test_add_command_without_install_dir_exits_with_error(self, capsys, empty_settings):
+        assert main(['add', str(empty_settings)]) == 1
 
-    def test_validate_command_valid_file(self, capsys):
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump({'valid': 'json'}, f)
-            filepath = f.name
-
-        try:
-            with patch('sys.argv', ['settings_manager.py', 'validate', filepath]):
-                with pytest.raises(SystemExit) as exc_info:
-                    from settings_manager import main
-                    main()
-                # Exit code 0 means success
-                assert exc_info.value.code == 0
-
-            captured = capsys.readouterr()
-            assert 'valid' in captured.out.lower()
-        finally:
-            os.unlink(filepath)
-
-    def test_validate_command_invalid_file(self, capsys):
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            f.write('not json')
-            filepath = f.name
-
-        try:
-            with patch('sys.argv', ['settings_manager.py', 'validate', filepath]):
-                with pytest.raises(SystemExit) as exc_info:
-                    from settings_manager import main
-                    main()
-                assert exc_info.value.code == 1
-        finally:
-            os.unlink(filepath)
-
-    def test_add_command(self, capsys):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            filepath = os.path.join(tmpdir, 'settings.json')
-            with open(filepath, 'w') as f:
-                json.dump({}, f)
-
-            with patch('sys.argv', ['settings_manager.py', 'add', filepath, '/install/dir']):
-                from settings_manager import main
-                main()
-
-            with open(filepath) as f:
-                result = json.load(f)
-            assert 'hooks' in result
-
-    def test_remove_command(self, capsys):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            filepath = os.path.join(tmpdir, 'settings.json')
-            with open(filepath, 'w') as f:
-                json.dump({
-                    'hooks': {
-                        'Stop': [{'hooks': [{'command': 'python3 tdd-orchestrator.py'}]}]
-                    }
-                }, f)
+    def test_remove_command(self, capsys, write_settings):
+        filepath = write_settings(SEED_TDD_STOP_HOOK)
 
-            with patch('sys.argv', ['settings_manager.py', 'remove', filepath]):
-                from settings_manager import main
-                main()
+        assert main(['remove', str(filepath)]) == 0
 
-            with open(filepath) as f:
-                result = json.load(f)
-            assert 'Stop' not in result.get('hooks', {})
+        result = json.loads(filepath.read_bytes())
+        assert 'Stop' not in result.get('hooks', {})
 
-    def test_unknown_command_exits_with_error(self):
-        with patch('sys.argv', ['settings_manager.py', 'unknown', '/path']):
-            with pytest.raises(SystemExit) as exc_info:
-                from settings_manager import main
-                main()
-            assert exc_info.value.code == 1
+    def test_unknown_command_exits_with_error(self, capsys):
+        assert main(['unknown', '/path']) == 1
 
-    def test_missing_args_exits_with_error(self):
-        with patch('sys.argv', ['settings_manager.py']):
-            with pytest.raises(SystemExit) as exc_info:
-                from settings_manager import main
-                main()
-            assert exc_info.value.code == 1
+    def test_missing_args_exits_with_error(self, capsys):
+        assert main([]) == 1
 
+    def test_reads_sys_argv_by_default(self, capsys, write_settings):
+        filepath = write_settings(SEED_VALID)
 
-if __name__ == '__main__':
-    pytest.main([__file__, '-v'])
+        with patch('sys.argv', ['settings_manager.py', 'validate', str(filepath)]):
+            assert main() == 0
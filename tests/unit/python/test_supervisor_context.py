@@ -256,6 +256,19 @@ class TestGetReviewPrompt:
             assert "SUMMARY_VERIFIED" in prompt
 
 
+class TestCompaction:
+    """Tests for session compaction prompts."""
+
+    def test_get_compact_state_prompt_returns_prompt(self):
+        prompt = ContextBuilder.get_compact_state_prompt()
+        assert len(prompt) > 0
+
+    def test_build_compacted_context_includes_state(self):
+        context = ContextBuilder.build_compacted_context(2, "- Decided on REST API")
+        assert "- Decided on REST API" in context
+        assert "Phase 2" in context
+
+
 class TestContextBuilderStaticMethods:
     """Tests verifying methods are static."""
 
@@ -10,6 +10,7 @@ import io
 import os
 import sys
 import tempfile
+import threading
 import pytest
 import asyncio
 from pathlib import Path
@@ -215,6 +216,39 @@ class TestTDDOrchestratorInit:
                 orchestrator = TDDOrchestrator(working_dir=tmpdir)
                 assert isinstance(orchestrator.markers, SupervisorMarkers)
 
+    def test_init_starts_no_worker_threads(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch.object(Path, 'home', return_value=Path(tmpdir)):
+                from tdd_supervisor.orchestrator import TDDOrchestrator
+                before = set(threading.enumerate())
+                TDDOrchestrator(working_dir=tmpdir)
+                with pytest.raises(ValueError):
+                    TDDOrchestrator(working_dir="/nonexistent/path/xyz")
+                assert set(threading.enumerate()) == before
+
+    def test_run_uses_and_shuts_down_executor(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch.object(Path, 'home', return_value=Path(tmpdir)):
+                from tdd_supervisor.orchestrator import TDDOrchestrator
+                orchestrator = TDDOrchestrator(working_dir=tmpdir)
+
+                worker_names = []
+
+                async def capture_worker(*args, **kwargs):
+                    worker_names.append(
+                        await asyncio.to_thread(lambda: threading.current_thread().name)
+                    )
+                    raise KeyboardInterrupt()
+
+                orchestrator._run_phase = capture_worker
+
+                run_async(orchestrator.run())
+
+                assert len(worker_names) == 1
+                assert worker_names[0].startswith("tdd-supervisor")
+                with pytest.raises(RuntimeError):
+                    orchestrator._executor.submit(lambda: None)
+
     def test_init_raises_for_invalid_directory(self):
         with tempfile.TemporaryDirectory() as tmpdir:
             with patch.object(Path, 'home', return_value=Path(tmpdir)):
@@ -250,13 +284,14 @@ class TestOrchestratorSignals:
         assert hasattr(TDDOrchestrator, 'GAPS_FOUND_SIGNAL')
         assert TDDOrchestrator.GAPS_FOUND_SIGNAL == "GAPS_FOUND"
 
-    def test_phase_names_dict_exists(self):
+    def test_phase_names_indexed_by_phase(self):
         from tdd_supervisor.orchestrator import TDDOrchestrator
         assert hasattr(TDDOrchestrator, 'PHASE_NAMES')
-        assert 1 in TDDOrchestrator.PHASE_NAMES
-        assert 2 in TDDOrchestrator.PHASE_NAMES
-        assert 3 in TDDOrchestrator.PHASE_NAMES
-        assert 4 in TDDOrchestrator.PHASE_NAMES
+        assert isinstance(TDDOrchestrator.PHASE_NAMES, tuple)
+        assert TDDOrchestrator.PHASE_NAMES[1] == "Requirements Gathering"
+        assert TDDOrchestrator.PHASE_NAMES[2] == "Interface Design"
+        assert TDDOrchestrator.PHASE_NAMES[3] == "Test Writing"
+        assert TDDOrchestrator.PHASE_NAMES[4] == "Implementation"
 
 
 class TestRunPhase:
@@ -298,6 +333,15 @@ class TestRunPhase:
 
                     assert phase_during_session == phase
 
+    def test_run_phase_rejects_invalid_phase(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch.object(Path, 'home', return_value=Path(tmpdir)):
+                from tdd_supervisor.orchestrator import TDDOrchestrator
+                orchestrator = TDDOrchestrator(working_dir=tmpdir)
+                with pytest.raises(ValueError) as exc_info:
+                    run_async(orchestrator._run_phase(5))
+                assert "Invalid phase" in str(exc_info.value)
+
     def test_run_phase_saves_requirements_summary(self):
         with tempfile.TemporaryDirectory() as tmpdir:
             with patch.object(Path, 'home', return_value=Path(tmpdir)):
@@ -474,6 +518,93 @@ class TestRunPhase:
                 assert "# Regenerated Requirements" in saved
 
 
+class TestReadPhaseDocument:
+    """Tests for _read_phase_document caching."""
+
+    def test_read_phase_document_reuses_cached_content(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch.object(Path, 'home', return_value=Path(tmpdir)):
+                from tdd_supervisor.orchestrator import TDDOrchestrator
+                orchestrator = TDDOrchestrator(working_dir=tmpdir)
+                orchestrator.markers.save_requirements_summary("# Requirements")
+
+                with patch.object(orchestrator.markers, 'get_phase_document',
+                                  wraps=orchestrator.markers.get_phase_document) as reader:
+                    assert orchestrator._read_phase_document(1) == "# Requirements"
+                    assert orchestrator._read_phase_document(1) == "# Requirements"
+                    assert reader.call_count == 1
+
+    def test_read_phase_document_detects_external_edit(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch.object(Path, 'home', return_value=Path(tmpdir)):
+                from tdd_supervisor.orchestrator import TDDOrchestrator
+                orchestrator = TDDOrchestrator(working_dir=tmpdir)
+                orchestrator.markers.save_requirements_summary("# Requirements")
+                assert orchestrator._read_phase_document(1) == "# Requirements"
+
+                # Simulate a manual edit by the user
+                orchestrator.markers.save_requirements_summary("# Edited Requirements")
+
+                assert orchestrator._read_phase_document(1) == "# Edited Requirements"
+
+    def test_save_phase_document_invalidates_cache(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch.object(Path, 'home', return_value=Path(tmpdir)):
+                from tdd_supervisor.orchestrator import TDDOrchestrator
+                orchestrator = TDDOrchestrator(working_dir=tmpdir)
+                orchestrator._save_phase_document(2, "# Interfaces A")
+                assert orchestrator._read_phase_document(2) == "# Interfaces A"
+
+                orchestrator._save_phase_document(2, "# Interfaces B")
+
+                assert orchestrator._read_phase_document(2) == "# Interfaces B"
+
+    def test_read_phase_document_missing_returns_empty(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch.object(Path, 'home', return_value=Path(tmpdir)):
+                from tdd_supervisor.orchestrator import TDDOrchestrator
+                orchestrator = TDDOrchestrator(working_dir=tmpdir)
+                assert orchestrator._read_phase_document(3) == ""
+
+
+class TestStreamOutput:
+    """Tests for buffered stream output (_emit / _flush_output)."""
+
+    def test_emit_buffers_until_newline(self, capsys):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch.object(Path, 'home', return_value=Path(tmpdir)):
+                from tdd_supervisor.orchestrator import TDDOrchestrator
+                orchestrator = TDDOrchestrator(working_dir=tmpdir)
+
+                orchestrator._emit("Hello, ")
+                orchestrator._emit("world")
+                assert capsys.readouterr().out == ""
+
+                orchestrator._emit("!\n")
+                assert capsys.readouterr().out == "Hello, world!\n"
+
+    def test_emit_flushes_when_threshold_exceeded(self, capsys):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch.object(Path, 'home', return_value=Path(tmpdir)):
+                from tdd_supervisor.orchestrator import TDDOrchestrator
+                orchestrator = TDDOrchestrator(working_dir=tmpdir)
+
+                chunk = "x" * (TDDOrchestrator.OUTPUT_FLUSH_THRESHOLD + 1)
+                orchestrator._emit(chunk)
+                assert capsys.readouterr().out == chunk
+
+    def test_flush_output_writes_pending_text(self, capsys):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch.object(Path, 'home', return_value=Path(tmpdir)):
+                from tdd_supervisor.orchestrator import TDDOrchestrator
+                orchestrator = TDDOrchestrator(working_dir=tmpdir)
+
+                orchestrator._emit("partial")
+                orchestrator._flush_output()
+                orchestrator._flush_output()
+                assert capsys.readouterr().out == "partial"
+
+
 class TestRegenerateSummary:
     """Tests for _regenerate_summary method."""
 
@@ -529,6 +660,23 @@ class TestGenerateAndVerifySummary:
                 result = run_async(orchestrator._generate_and_verify_summary(4))
                 assert result == ""
 
+    def test_generate_and_verify_skips_query_for_phase4(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch.object(Path, 'home', return_value=Path(tmpdir)):
+                from tdd_supervisor.orchestrator import TDDOrchestrator
+                orchestrator = TDDOrchestrator(working_dir=tmpdir)
+                orchestrator._query_for_text = AsyncMock(return_value="unused")
+
+                result = run_async(orchestrator._generate_and_verify_summary(4))
+
+                assert result == ""
+                orchestrator._query_for_text.assert_not_called()
+
+    def test_summary_and_review_phases(self):
+        from tdd_supervisor.orchestrator import SUMMARY_PHASES, REVIEW_PHASES
+        assert SUMMARY_PHASES == frozenset({1, 2, 3})
+        assert REVIEW_PHASES == frozenset({1, 2, 3})
+
     def test_generate_and_verify_calls_query_for_text(self):
         with tempfile.TemporaryDirectory() as tmpdir:
             with patch.object(Path, 'home', return_value=Path(tmpdir)):
@@ -621,6 +769,100 @@ class TestGenerateAndVerifySummary:
                 assert "Some other response" in result
 
 
+class TestSessionCompaction:
+    """Tests for condensing long phase sessions before summary generation."""
+
+    def _run_phase_recording_sessions(self, orchestrator, transcript_bytes):
+        """Run phase 1 with a regenerate round; return the session IDs resumed."""
+        resumed_sessions = []
+
+        async def mock_run_session(*args, **kwargs):
+            orchestrator._phase_transcript_bytes = transcript_bytes
+            return "phase-session"
+
+        async def mock_generate_and_verify(phase, session_id=None):
+            resumed_sessions.append(session_id)
+            return "# Summary"
+
+        async def mock_regenerate(phase, session_id=None):
+            resumed_sessions.append(session_id)
+            return "# Regenerated"
+
+        actions = iter(['regenerate', 'proceed'])
+
+        async def mock_confirm(*args, **kwargs):
+            return next(actions)
+
+        async def mock_query_for_text(prompt, session_id=None, phase=None):
+            return "- condensed state"
+
+        orchestrator._run_phase_session = mock_run_session
+        orchestrator._generate_and_verify_summary = mock_generate_and_verify
+        orchestrator._regenerate_summary = mock_regenerate
+        orchestrator._confirm_phase_completion = mock_confirm
+        orchestrator._query_for_text = mock_query_for_text
+
+        run_async(orchestrator._run_phase(1, "test"))
+        return resumed_sessions
+
+    def test_phase_resumes_original_session_under_budget(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch.object(Path, 'home', return_value=Path(tmpdir)):
+                from tdd_supervisor.orchestrator import TDDOrchestrator
+                orchestrator = TDDOrchestrator(working_dir=tmpdir)
+                orchestrator._start_session = AsyncMock(return_value="compact-session")
+
+                resumed_sessions = self._run_phase_recording_sessions(orchestrator, 100)
+
+                assert resumed_sessions == ["phase-session", "phase-session"]
+                orchestrator._start_session.assert_not_called()
+
+    def test_phase_resumes_compacted_session_over_budget(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch.object(Path, 'home', return_value=Path(tmpdir)):
+                from tdd_supervisor.orchestrator import TDDOrchestrator
+                orchestrator = TDDOrchestrator(working_dir=tmpdir)
+                orchestrator._start_session = AsyncMock(return_value="compact-session")
+
+                resumed_sessions = self._run_phase_recording_sessions(
+                    orchestrator, TDDOrchestrator.TRANSCRIPT_BUDGET_BYTES + 1
+                )
+
+                # Summary and regeneration both resume the condensed session
+                assert resumed_sessions == ["compact-session", "compact-session"]
+                seed_prompt = orchestrator._start_session.call_args[0][0]
+                assert "- condensed state" in seed_prompt
+                assert orchestrator._phase_transcript_bytes == len("- condensed state")
+
+    def test_compact_session_keeps_original_on_empty_state(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch.object(Path, 'home', return_value=Path(tmpdir)):
+                from tdd_supervisor.orchestrator import TDDOrchestrator
+                orchestrator = TDDOrchestrator(working_dir=tmpdir)
+                orchestrator._query_for_text = AsyncMock(return_value="")
+                orchestrator._start_session = AsyncMock(return_value="compact-session")
+
+                result = run_async(orchestrator._compact_session(1, "phase-session"))
+
+                assert result == "phase-session"
+                orchestrator._start_session.assert_not_called()
+
+    def test_start_session_times_out(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch.object(Path, 'home', return_value=Path(tmpdir)):
+                from tdd_supervisor.orchestrator import TDDOrchestrator
+                orchestrator = TDDOrchestrator(working_dir=tmpdir)
+
+                async def stalled_query(*args, **kwargs):
+                    await asyncio.sleep(10)
+                    yield MagicMock(session_id="never-seen")
+
+                with patch('tdd_supervisor.orchestrator.query', stalled_query):
+                    result = run_async(orchestrator._start_session("seed", phase=1, timeout=0.01))
+
+                assert result is None
+
+
 class TestRunSupervisor:
     """Tests for run_supervisor function."""
 
@@ -652,6 +894,28 @@ class TestKeyboardInterruptHandling:
                 # Markers should be cleaned up on interrupt
                 assert not orchestrator.markers.markers_dir.exists()
 
+    def test_keyboard_interrupt_at_confirmation_cleans_up_markers(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch.object(Path, 'home', return_value=Path(tmpdir)):
+                from tdd_supervisor.orchestrator import TDDOrchestrator
+                orchestrator = TDDOrchestrator(working_dir=tmpdir)
+
+                async def confirm(*args, **kwargs):
+                    await orchestrator._confirm_phase_completion(1)
+
+                orchestrator._run_phase = confirm
+
+                # SIGINT is only delivered to the main thread, so the prompt
+                # must be read there for KeyboardInterrupt to reach run()
+                def interrupt(prompt):
+                    assert threading.current_thread() is threading.main_thread()
+                    raise KeyboardInterrupt()
+
+                with patch('builtins.input', interrupt):
+                    run_async(orchestrator.run())
+
+                assert not orchestrator.markers.markers_dir.exists()
+
 
 class TestConfirmPhaseCompletion:
     """Tests for _confirm_phase_completion method."""
@@ -116,6 +116,19 @@ class TestReviewPromptTemplates:
             assert "SUMMARY_VERIFIED" in prompt, f"{prompt_name} should mention SUMMARY_VERIFIED"
 
 
+class TestCompactionTemplates:
+    """Tests for session compaction templates."""
+
+    def test_compact_state_prompt_exists(self):
+        assert hasattr(templates, 'COMPACT_STATE_PROMPT')
+        assert len(templates.COMPACT_STATE_PROMPT) > 0
+
+    def test_compacted_session_context_has_placeholders(self):
+        assert hasattr(templates, 'COMPACTED_SESSION_CONTEXT')
+        assert "{phase}" in templates.COMPACTED_SESSION_CONTEXT
+        assert "{compact_state}" in templates.COMPACTED_SESSION_CONTEXT
+
+
 class TestFormatPhaseHeader:
     """Tests for format_phase_header function."""
 
@@ -4,14 +4,10 @@ Unit tests for tdd_agents.py
 """
 
 import os
-import sys
 import tempfile
-import pytest
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
-# Add hooks/lib to path
-sys.path.insert(0, 'hooks/lib')
 from tdd_agents import AgentLoader
 
 
@@ -196,7 +192,3 @@ phases: [3]
         loader = AgentLoader("/nonexistent/dir")
         result = loader.list_agents()
         assert result == "[]"
-
-
-if __name__ == '__main__':
-    pytest.main([__file__, '-v'])
@@ -7,13 +7,9 @@ import json
 import os
 import sys
 import tempfile
-import pytest
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
-# Add hooks/lib to path
-sys.path.insert(0, 'hooks/lib')
-
 # Mock the dependent modules before importing TDDConfig
 sys.modules['config_reader'] = MagicMock()
 sys.modules['profile_detector'] = MagicMock()
@@ -272,7 +268,3 @@ class TestGetTodoPlaceholder:
         with patch.object(config, 'detect_profile', return_value=None):
             result = config.get_todo_placeholder()
             assert result is None
-
-
-if __name__ == '__main__':
-    pytest.main([__file__, '-v'])
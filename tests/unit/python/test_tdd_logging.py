@@ -4,15 +4,11 @@ Unit tests for tdd_logging.py
 """
 
 import os
-import sys
 import tempfile
-import pytest
 from datetime import datetime
 from pathlib import Path
 from unittest.mock import patch
 
-# Add hooks/lib to path
-sys.path.insert(0, 'hooks/lib')
 from tdd_logging import TDDLogger
 
 
@@ -195,7 +191,3 @@ class TestTDDLogger:
                     logger.log_event("TEST", "Message")
                 finally:
                     logger.log_dir.chmod(0o755)
-
-
-if __name__ == '__main__':
-    pytest.main([__file__, '-v'])